@@ -1,48 +1,108 @@
+import os
 import dash
 from dash import dcc, html
-from dash.dependencies import Input, Output
+from dash.dependencies import Input, Output, State
+from dash.exceptions import PreventUpdate
 import plotly.express as px
 import pandas as pd
 import requests
+import time
+import perf
+from api_client import SyncedTables, fetch_frame
+from preprocessing import publication_years, school_year_labels, split_authors
+from author_resolution import NameCanonicalizer
+from author_search import AuthorSearchIndex
+from snapshots import load_snapshot
 
 # Define API base URL
-BASE_URL = "http://127.0.0.1:5000"
-
-# Fetch data from API
-authors = requests.get(f"{BASE_URL}/authors").json()
-research_authors = requests.get(f"{BASE_URL}/research_authors").json()
-research_data = requests.get(f"{BASE_URL}/researches").json()
-campuses = requests.get(f"{BASE_URL}/campuses").json()
-colleges = requests.get(f"{BASE_URL}/colleges").json()
-programs = requests.get(f"{BASE_URL}/programs").json()
-
-# Convert JSON to DataFrames
-df_authors = pd.DataFrame(authors)
-df_research_authors = pd.DataFrame(research_authors)
-df_research_data = pd.DataFrame(research_data)
-df_campuses = pd.DataFrame(campuses)
-df_colleges = pd.DataFrame(colleges)
-df_programs = pd.DataFrame(programs)
-
-# Merge data
-df_authors = df_authors.merge(df_campuses, left_on='campus_id', right_on='camp_id', suffixes=('', '_campus'))
-df_research_authors = df_research_authors.merge(df_authors, left_on='author_id', right_on='id', suffixes=('', '_author'))
-df_research_authors = df_research_authors.merge(df_research_data, left_on='research_id', right_on='id', suffixes=('', '_research'))
-df_research_authors = df_research_authors.merge(df_colleges, left_on='college_id', right_on='id', suffixes=('', '_college'))
-df_research_authors = df_research_authors.merge(df_programs, left_on='program_id', right_on='id', suffixes=('', '_program'))
-
-# Drop duplicate ID columns
-df_research_authors.drop(columns=['id', 'id_research', 'id_author', 'id_college', 'id_program', 'id_campus'], inplace=True, errors='ignore')
-df_final = df_research_authors.dropna(subset=['name', 'college_name', 'program_name', 'date_of_publication', 'title_of_research'])
-
-df_final['name'] = df_final['name'].astype(str).str.split(r'[\n,]')
-df_final = df_final.explode('name').reset_index(drop=True)
-df_final['name'] = df_final['name'].str.strip()
-df_final['year'] = pd.to_datetime(df_final['date_of_publication'], errors='coerce').dt.year.dropna().astype(int)
-df_final['school_year'] = df_final['year'].apply(lambda y: f"SY {y}-{y + 1}")
-
-df = df_final.copy()
-df['School Year'] = df['school_year']
+BASE_URL = os.environ.get("RDMO_API_URL", "http://127.0.0.1:5000")
+
+# Seconds between incremental syncs of the research/author tables
+REFRESH_SECONDS = 60
+
+# Most author suggestions shown while typing
+SEARCH_LIMIT = 20
+
+# Research, author and link tables are downloaded once, then kept current through /changes
+tables = SyncedTables(BASE_URL)
+tables.load()
+
+# Lookup tables are small; fetch them once
+df_campuses = fetch_frame(f"{BASE_URL}/campuses")
+df_colleges = fetch_frame(f"{BASE_URL}/colleges")
+df_programs = fetch_frame(f"{BASE_URL}/programs")
+
+# Spelling variants are merged incrementally: names seen before keep their canonical form
+canonicalizer = NameCanonicalizer()
+
+def build_frame(links):
+    # Merged rows for the given research_authors links; only their authors and papers are joined
+    df_authors = tables.frames['authors']
+    df_authors = df_authors[df_authors['id'].isin(links['author_id'])]
+    df_researches = tables.frames['researches']
+    df_researches = df_researches[df_researches['id'].isin(links['research_id'])]
+
+    # Merge data
+    df_authors = df_authors.merge(df_campuses, left_on='campus_id', right_on='camp_id', suffixes=('', '_campus'))
+    df_research_authors = links.merge(df_authors, left_on='author_id', right_on='id', suffixes=('', '_author'))
+    df_research_authors = df_research_authors.merge(df_researches, left_on='research_id', right_on='id', suffixes=('', '_research'))
+    df_research_authors = df_research_authors.merge(df_colleges, left_on='college_id', right_on='id', suffixes=('', '_college'))
+    df_research_authors = df_research_authors.merge(df_programs, left_on='program_id', right_on='id', suffixes=('', '_program'))
+
+    # Drop duplicate ID columns
+    df_research_authors.drop(columns=['id', 'id_research', 'id_author', 'id_college', 'id_program', 'id_campus'], inplace=True, errors='ignore')
+    df_final = df_research_authors.dropna(subset=['name', 'college_name', 'program_name', 'date_of_publication', 'title_of_research'])
+    df_final = split_authors(df_final, 'name')
+    # Merge spelling variants within each author record; distinct author ids are never merged
+    df_final['name'] = canonicalizer.canonicalize(df_final['name'], df_final['author_id'])
+    df_final['year'] = publication_years(df_final['date_of_publication'])
+    df_final = df_final.dropna(subset=['year'])  # Drop rows whose publication date could not be parsed
+    df_final['school_year'] = school_year_labels(df_final['year'])
+    df_final['School Year'] = df_final['school_year']
+    return df_final
+
+def affected_research_ids(changes):
+    # Papers whose merged rows a /changes delta invalidates
+    ids = set()
+    for name, id_field in (('researches', 'id'), ('research_authors', 'research_id')):
+        if name in changes:
+            ids.update(row[id_field] for row in changes[name]['upserts'] + changes[name]['deletes'])
+    if 'authors' in changes:
+        author_ids = {row['id'] for row in changes['authors']['upserts'] + changes['authors']['deletes']}
+        links = tables.frames['research_authors']
+        ids.update(links.loc[links['author_id'].isin(author_ids), 'research_id'])
+        ids.update(df.loc[df['author_id'].isin(author_ids), 'research_id'])
+    return ids
+
+def build_search_index(names):
+    return AuthorSearchIndex(zip(names, names))
+
+df = build_frame(tables.frames['research_authors'])
+author_names = set(df['name'].dropna().unique())
+author_search = build_search_index(author_names)
+last_refresh = time.monotonic()
+
+def refresh_data():
+    # Apply server-side changes at most every REFRESH_SECONDS, rebuilding only the papers they touch
+    global df, author_names, author_search, last_refresh
+    if time.monotonic() - last_refresh < REFRESH_SECONDS:
+        return
+    last_refresh = time.monotonic()
+    try:
+        changes = tables.refresh()
+    except requests.exceptions.RequestException:
+        return  # Keep serving the current frame; retry after the next interval
+    if not changes:
+        return
+
+    ids = affected_research_ids(changes)
+    links = tables.frames['research_authors']
+    df = pd.concat([df[~df['research_id'].isin(ids)], build_frame(links[links['research_id'].isin(ids)])], ignore_index=True)
+
+    names = set(df['name'].dropna().unique())
+    if names != author_names:
+        author_names = names
+        author_search = build_search_index(names)
 
 # Initialize Dash app
 app = dash.Dash(__name__)
@@ -73,7 +133,8 @@ app.layout = html.Div([
         html.Label("Select Author:"),
         dcc.Dropdown(
             id='author-dropdown',
-            options=[{'label': author, 'value': author} for author in sorted(df['name'].dropna().unique())],
+            options=[],  # Filled by search_authors as the user types
+            placeholder="Type to search for an author",
             value=None,
             style={'width': '300px'}
         ),
@@ -113,6 +174,20 @@ app.layout = html.Div([
 ], style={'display': 'flex', 'flexDirection': 'column', 'minHeight': '100vh'})
 
 
+@app.callback(
+    Output('author-dropdown', 'options'),
+    Input('author-dropdown', 'search_value'),
+    State('author-dropdown', 'value')
+)
+def search_authors(search_value, selected_author):
+    if not search_value:
+        raise PreventUpdate  # Keep the current options (and the selected author's label)
+    names = [name for name, _ in author_search.search(search_value, SEARCH_LIMIT)]
+    if selected_author and selected_author not in names:
+        names.append(selected_author)
+    return [{'label': name, 'value': name} for name in names]
+
+
 @app.callback(
     [Output('author-credentials', 'children'),
      Output('papers-by-year', 'figure'),
@@ -123,27 +198,48 @@ app.layout = html.Div([
      Input('start-year-dropdown', 'value'),
      Input('end-year-dropdown', 'value')]
 )
+@perf.profiled
 def update_graphs(selected_author, start_sy, end_sy):
     if not selected_author:
         return "", {}, {}, {}, {'display': 'none'}
-    
-    filtered_df = df[(df['name'] == selected_author) &
-                     (df['School Year'] >= start_sy) &
-                     (df['School Year'] <= end_sy)]
-    
-    author_info = f"Displaying information for: {selected_author}"
-    papers_by_year = filtered_df.groupby('School Year')['title_of_research'].count().reset_index()
-    fig1 = px.bar(papers_by_year, x='School Year', y='title_of_research', title=f'Number of Papers by {selected_author}', text_auto=True)
-    
-    college_distribution = filtered_df['college_name'].value_counts().reset_index()
-    college_distribution.columns = ['College', 'Count']
-    fig2 = px.pie(college_distribution, names='College', values='Count', title='College Distribution')
-    
-    program_distribution = filtered_df['program_name'].value_counts().reset_index()
-    program_distribution.columns = ['Program', 'Count']
-    fig3 = px.pie(program_distribution, names='Program', values='Count', title='Program Distribution')
-    
+
+    with perf.stage('fetch'):
+        refresh_data()
+
+    # The full school-year range is pre-rendered per author by render.py; custom ranges are computed
+    # live, and so is the full range once the synced data has moved past the snapshot's version
+    if [start_sy, end_sy] == [available_school_years[0], available_school_years[-1]]:
+        with perf.stage('snapshot'):
+            snapshot = load_snapshot('authors', selected_author, tables.version)
+        if snapshot is not None:
+            return snapshot
+
+    return compute_graphs(selected_author, start_sy, end_sy)
+
+def compute_graphs(selected_author, start_sy, end_sy):
+    with perf.stage('filter'):
+        filtered_df = df[(df['name'] == selected_author) &
+                         (df['School Year'] >= start_sy) &
+                         (df['School Year'] <= end_sy)]
+
+    with perf.stage('aggregate'):
+        papers_by_year = filtered_df.groupby('School Year')['title_of_research'].count().reset_index()
+
+        college_distribution = filtered_df['college_name'].value_counts().reset_index()
+        college_distribution.columns = ['College', 'Count']
+
+        program_distribution = filtered_df['program_name'].value_counts().reset_index()
+        program_distribution.columns = ['Program', 'Count']
+
+    with perf.stage('figures'):
+        author_info = f"Displaying information for: {selected_author}"
+        fig1 = px.bar(papers_by_year, x='School Year', y='title_of_research', title=f'Number of Papers by {selected_author}', text_auto=True)
+        fig2 = px.pie(college_distribution, names='College', values='Count', title='College Distribution')
+        fig3 = px.pie(program_distribution, names='Program', values='Count', title='Program Distribution')
+
     return author_info, fig1, fig2, fig3, {'display': 'block'}
 
+perf.install(app)
+
 if __name__ == '__main__':
     app.run_server(debug=True)
\ No newline at end of file
@@ -0,0 +1,116 @@
+import io
+from datetime import datetime
+import pandas as pd
+import requests
+
+try:
+    import pyarrow  # noqa: F401  (pd.read_feather needs it)
+except ImportError:
+    pyarrow = None
+
+ARROW_MIMETYPE = 'application/vnd.apache.arrow.file'
+
+
+def fetch_frame(url, params=None, timeout=30):
+    """GET an API listing straight into a DataFrame.
+
+    Bulk endpoints answer in Arrow when pyarrow is installed here; anything
+    else (small endpoints, older API servers) comes back as JSON records.
+    Compressed JSON is decoded transparently by requests.
+    """
+    accept = f"{ARROW_MIMETYPE}, application/json;q=0.9" if pyarrow else 'application/json'
+    response = requests.get(url, params=params, headers={'Accept': accept}, timeout=timeout)
+    response.raise_for_status()
+    if response.headers.get('Content-Type', '').startswith(ARROW_MIMETYPE):
+        frame = pd.read_feather(io.BytesIO(response.content))
+    else:
+        frame = pd.DataFrame(response.json())
+    # Bulk endpoints say when they were read (/changes?since= continues from there)
+    # and which version of the data they returned
+    frame.attrs['watermark'] = response.headers.get('X-Watermark')
+    frame.attrs['version'] = response.headers.get('X-Data-Version')
+    return frame
+
+
+# Primary key columns of the tables /changes reports on
+SYNC_KEYS = {
+    'researches': ['id'],
+    'authors': ['id'],
+    'research_authors': ['research_id', 'author_id'],
+}
+
+
+def apply_changes(frame, delta, key):
+    """Apply one table's /changes delta (deletes, then upserts) to ``frame``."""
+    upserts = pd.DataFrame(delta['upserts'])
+    if frame.empty:
+        return upserts
+
+    stale = pd.DataFrame(delta['deletes'], columns=key)
+    if not upserts.empty:
+        stale = pd.concat([stale, upserts[key]], ignore_index=True)
+    if not stale.empty:
+        existing = pd.MultiIndex.from_frame(frame[key])
+        frame = frame[~existing.isin(pd.MultiIndex.from_frame(stale))]
+    return pd.concat([frame, upserts], ignore_index=True)
+
+
+# Bulk listing of each synced table, used for the initial download
+SYNC_SNAPSHOTS = {
+    'researches': '/researches',
+    'authors': '/authors',
+    'research_authors': '/research_authors',
+}
+
+
+class SyncedTables:
+    """In-memory copies of the API's research, author and link tables.
+
+    load() downloads everything through the bulk endpoints (Arrow when
+    available); refresh() then only fetches what changed since the previous
+    watermark and patches the frames in place.
+    """
+
+    def __init__(self, base_url, timeout=30):
+        self.base_url = base_url
+        self.timeout = timeout
+        self.watermark = None
+        self.version = None  # the API's data_version() the frames reflect
+        self.frames = {name: pd.DataFrame() for name in SYNC_KEYS}
+
+    def load(self):
+        """Download full copies of every table."""
+        frames = {name: fetch_frame(f"{self.base_url}{path}", timeout=self.timeout) for name, path in SYNC_SNAPSHOTS.items()}
+        watermarks = [frame.attrs.get('watermark') for frame in frames.values()]
+        if None in watermarks:
+            # API servers without X-Watermark: start from a full /changes snapshot instead
+            self.watermark = None
+            self.refresh()
+            return
+        self.frames = frames
+        # The oldest read decides where syncing resumes; replaying a few rows is harmless
+        self.watermark = min(watermarks, key=datetime.fromisoformat)
+        versions = {frame.attrs.get('version') for frame in frames.values()}
+        # Data written between the reads: leave the version unknown until the next refresh()
+        self.version = versions.pop() if len(versions) == 1 else None
+
+    def refresh(self):
+        """Pull the latest changes and return {table: delta} for the tables that changed."""
+        params = {'since': self.watermark} if self.watermark else None
+        response = requests.get(f"{self.base_url}/changes", params=params, timeout=self.timeout)
+        response.raise_for_status()
+        payload = response.json()
+
+        changed = {}
+        for name, key in SYNC_KEYS.items():
+            delta = payload[name]
+            if self.watermark is None:
+                self.frames[name] = pd.DataFrame(delta['upserts'])
+                changed[name] = delta
+            elif delta['upserts'] or delta['deletes']:
+                self.frames[name] = apply_changes(self.frames[name], delta, key)
+                changed[name] = delta
+
+        self.watermark = payload['watermark']
+        self.version = payload.get('version')
+        return changed
@@ -0,0 +1,212 @@
+import re
+import unicodedata
+from collections import Counter, defaultdict
+from difflib import SequenceMatcher
+from itertools import repeat
+from typing import NamedTuple
+
+# Surname particles kept with the surname ("Juan Dela Cruz" -> surname "delacruz")
+PARTICLES = {'de', 'del', 'dela', 'della', 'delos', 'la', 'las', 'los', 'san', 'santa', 'sta', 'da', 'di', 'van', 'von'}
+SUFFIXES = {'jr', 'sr', 'ii', 'iii', 'iv'}
+TITLES = {'dr', 'engr', 'prof', 'mr', 'mrs', 'ms', 'ar', 'atty'}
+
+# Spelled-out given names this similar but not equal ("Juan"/"Juana", "Ana"/"Anna") are often
+# different people; they are never merged, only reported as near misses for a person to review
+GIVEN_NAME_THRESHOLD = 0.85
+
+
+class ParsedName(NamedTuple):
+    surname: str
+    given: tuple  # normalized given-name tokens; single letters are initials
+
+    @property
+    def block_key(self):
+        return self.surname, self.given[0][0] if self.given else ''
+
+
+def normalize_text(text):
+    """Lower-case ``text`` and strip accents ("Peña" -> "pena")."""
+    text = unicodedata.normalize('NFKD', text)
+    return ''.join(c for c in text if not unicodedata.combining(c)).lower()
+
+
+def _tokens(text):
+    text = normalize_text(text)
+    # "J.M." is two initials, "Ma." is an abbreviation of one name
+    text = re.sub(r'\b([a-z])\.(?=[a-z]\b)', r'\1 ', text)
+    return [t for t in re.split(r'[^a-z]+', text) if t and t not in TITLES and t not in SUFFIXES]
+
+
+def _is_initial(token):
+    return len(token) == 1
+
+
+def parse_name(raw):
+    """Split a free-text author name into a normalized surname and given names.
+
+    Handles "Juan Cruz", "J. Cruz", "Cruz, Juan", "Cruz J." and surname
+    particles such as "Dela Cruz". Returns None for strings with no letters.
+    """
+    head, sep, tail = raw.partition(',')
+    if sep and _tokens(tail):
+        # "Cruz, Juan": surname first
+        surname, given = _tokens(head), _tokens(tail)
+    else:
+        tokens = _tokens(head)
+        if not tokens:
+            return None
+        if len(tokens) > 1 and _is_initial(tokens[-1]) and not _is_initial(tokens[0]):
+            # "Cruz J." / "Cruz J.M."
+            split = next(i for i, t in enumerate(tokens) if _is_initial(t))
+            surname, given = tokens[:split], tokens[split:]
+        else:
+            split = len(tokens) - 1
+            while split > 0 and tokens[split - 1] in PARTICLES:
+                split -= 1
+            surname, given = tokens[split:], tokens[:split]
+
+    if not surname:
+        return None
+    return ParsedName(''.join(surname), tuple(given))
+
+
+def _given_similarity(a, b):
+    """Score how well two given-name tuples agree, or None if they conflict.
+
+    An initial agrees with any name it abbreviates; spelled-out names only
+    agree when they are equal.
+    """
+    if not a or not b:
+        return 0.9  # surname-only entries match weakly
+    scores = []
+    # Compare position by position; extra middle names on one side are not a conflict
+    for x, y in zip(a, b):
+        if _is_initial(x) or _is_initial(y):
+            if x[0] != y[0]:
+                return None
+            scores.append(0.95)
+        else:
+            if x != y:
+                return None
+            scores.append(1.0)
+    return sum(scores) / len(scores)
+
+
+def _near_miss(a, b):
+    # Given names that differ only by close spellings of spelled-out names
+    return bool(a and b) and all(
+        x[0] == y[0] if _is_initial(x) or _is_initial(y) else SequenceMatcher(None, x, y).ratio() >= GIVEN_NAME_THRESHOLD
+        for x, y in zip(a, b)
+    )
+
+
+class AuthorIndex:
+    """Resolve raw author strings to canonical author ids.
+
+    Names are bucketed by (surname, first initial), so each lookup is only
+    compared against the handful of authors sharing that key rather than
+    the whole table. A string resolves only when exactly one author in its
+    bucket is compatible; ambiguous abbreviations stay unresolved, and so do
+    close spellings of a known name, which near_misses() reports instead.
+    """
+
+    def __init__(self):
+        self._blocks = defaultdict(list)
+        self._surnames = defaultdict(list)
+        self._cache = {}
+        self._near_misses = {}
+
+    def add(self, author_id, name):
+        parsed = parse_name(name)
+        if parsed is None:
+            return
+        self._blocks[parsed.block_key].append((author_id, parsed))
+        self._surnames[parsed.surname].append((author_id, parsed))
+        self._cache.clear()
+        self._near_misses.clear()
+
+    def resolve(self, raw):
+        """Canonical id for ``raw``, or None if it matches no (or more than one) author."""
+        if raw not in self._cache:
+            self._cache[raw] = self._resolve(raw)
+        return self._cache[raw]
+
+    def near_misses(self, raw):
+        """Ids of authors whose given names are close spellings of those in ``raw``."""
+        if raw not in self._near_misses:
+            parsed = parse_name(raw)
+            candidates = self._blocks[parsed.block_key] if parsed and parsed.given else []
+            self._near_misses[raw] = sorted({
+                author_id for author_id, candidate in candidates
+                if _given_similarity(parsed.given, candidate.given) is None and _near_miss(parsed.given, candidate.given)
+            })
+        return self._near_misses[raw]
+
+    def _resolve(self, raw):
+        parsed = parse_name(raw)
+        if parsed is None:
+            return None
+        # Surname-only strings have no initial to block on; fall back to the surname bucket
+        candidates = self._blocks[parsed.block_key] if parsed.given else self._surnames[parsed.surname]
+        best = {}
+        for author_id, candidate in candidates:
+            score = _given_similarity(parsed.given, candidate.given)
+            if score is not None:
+                best[author_id] = max(score, best.get(author_id, 0))
+        if not best:
+            return None
+        top = sorted(best.values(), reverse=True)
+        # Several distinct authors fit equally well (e.g. "J. Cruz" vs Juan and Jose Cruz)
+        if len(top) > 1 and top[0] - top[1] < 0.05:
+            return None
+        return max(best, key=best.get)
+
+
+def _spelled_out(name):
+    parsed = parse_name(name)
+    return sum(not _is_initial(t) for t in parsed.given) if parsed else 0
+
+
+class NameCanonicalizer:
+    """canonical_names() that keeps its clusters between calls.
+
+    Only names not seen before are matched, each against every earlier
+    cluster, so a new spelling joins its author without re-clustering the
+    names already known. Canonical spellings never change once chosen.
+    """
+
+    def __init__(self):
+        self._indexes = defaultdict(AuthorIndex)
+        self._canonical = {}
+
+    def canonicalize(self, names, groups=None):
+        """Map each raw author string in ``names`` to its canonical spelling.
+
+        ``groups`` (aligned with ``names``, e.g. the database author ids)
+        keeps variants from being merged across groups: names that already
+        belong to different authors stay apart however alike they look.
+        """
+        keys = list(zip(groups if groups is not None else repeat(None), names))
+        counts = Counter(keys)
+        new = [key for key in counts if key not in self._canonical]
+        for group, name in sorted(new, key=lambda k: (-_spelled_out(k[1]), -counts[k], -len(k[1]))):
+            index = self._indexes[group]
+            match = index.resolve(name)
+            if match is None:
+                index.add(name, name)
+                match = name
+            self._canonical[group, name] = match
+        result = names.copy()
+        result[:] = [self._canonical[key] for key in keys]
+        return result
+
+
+def canonical_names(names):
+    """Map each raw author string in ``names`` to a canonical spelling.
+
+    Variants are clustered against each other. Spelled-out names are seen
+    first, so "Juan Cruz" absorbs "J. Cruz" and "Cruz, Juan" rather than the
+    other way round; among those the most frequent spelling wins. Returns a
+    Series aligned with ``names``.
+    """
+    return NameCanonicalizer().canonicalize(names)
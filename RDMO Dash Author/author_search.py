@@ -0,0 +1,80 @@
+import heapq
+import re
+from bisect import bisect_left
+from collections import Counter, defaultdict
+
+from author_resolution import normalize_text
+
+
+def _words(text):
+    return [w for w in re.split(r'[^a-z0-9]+', normalize_text(text)) if w]
+
+
+def _trigrams(word):
+    padded = f"  {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class AuthorSearchIndex:
+    """Typeahead lookup over author names.
+
+    Every word of every name goes into a sorted list, so a prefix query is
+    a binary search. When prefixes find fewer than ``limit`` names, a
+    trigram index fills the rest with near misses ("Cruzz", "Santso").
+    """
+
+    def __init__(self, entries):
+        # entries: (value, label) pairs, e.g. (author id, author name)
+        self._labels = {}
+        self._words = {}
+        self._trigrams = defaultdict(set)
+        keys = []
+        for value, label in entries:
+            words = _words(label)
+            self._labels[value] = label
+            self._words[value] = words
+            for word in words:
+                keys.append((word, value))
+                for gram in _trigrams(word):
+                    self._trigrams[gram].add(value)
+        keys.sort(key=lambda k: k[0])
+        self._keys = [k[0] for k in keys]
+        self._values = [k[1] for k in keys]
+
+    def __len__(self):
+        return len(self._labels)
+
+    def _prefix_matches(self, prefix):
+        start = bisect_left(self._keys, prefix)
+        end = bisect_left(self._keys, prefix + '\uffff', lo=start)
+        return set(self._values[start:end])
+
+    def search(self, query, limit=20):
+        """Return up to ``limit`` (value, label) pairs matching ``query``."""
+        words = _words(query)
+        if not words or limit <= 0:
+            return []
+
+        # Narrow with the longest typed word, then require every other word to prefix some name word
+        longest = max(words, key=len)
+        matches = [
+            value for value in self._prefix_matches(longest)
+            if all(any(w.startswith(q) for w in self._words[value]) for q in words)
+        ]
+        # Names that start with the query first, then alphabetical
+        results = heapq.nsmallest(
+            limit, matches,
+            key=lambda value: (not normalize_text(self._labels[value]).startswith(words[0]), self._labels[value])
+        )
+
+        if len(results) < limit and len(longest) >= 3:
+            grams = _trigrams(longest)
+            counts = Counter(value for gram in grams for value in self._trigrams.get(gram, ()))
+            seen = set(results)
+            for value, shared in counts.most_common():
+                if shared < len(grams) / 2 or len(results) >= limit:
+                    break
+                if value not in seen:
+                    results.append(value)
+
+        return [(value, self._labels[value]) for value in results]
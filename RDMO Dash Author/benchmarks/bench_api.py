@@ -0,0 +1,118 @@
+from collections import Counter
+from datetime import datetime, timezone
+
+import pytest
+
+import api_client
+
+ROUTES = [
+    '/authors',
+    '/authors/search?q=sura&limit=20',
+    '/researches',
+    '/researches?author_id=1',
+    '/researches/page?limit=25',
+    '/researches/page?limit=25&sort=-school_year&contains.title_of_research=paper 1',
+    '/author_research/1',
+    '/research_authors',
+    '/campuses',
+    '/colleges',
+    '/colleges?campus_id=1',
+    '/programs',
+    '/programs?college_id=1',
+    '/hierarchy',
+    '/changes',
+    '/rollup',
+]
+
+BULK_ROUTES = ['/authors', '/researches', '/research_authors']
+
+ENCODINGS = {
+    'json': {'Accept-Encoding': 'identity'},
+    'gzip': {'Accept-Encoding': 'gzip'},
+    'br': {'Accept-Encoding': 'br'},
+    'arrow': {'Accept': api_client.ARROW_MIMETYPE},
+}
+
+
+@pytest.mark.benchmark(group='api')
+@pytest.mark.parametrize('route', ROUTES)
+def test_route(benchmark, client, route):
+    response = benchmark(client.get, route)
+    assert response.status_code == 200
+
+
+@pytest.mark.benchmark(group='api')
+def test_changes_since_now(benchmark, client):
+    # Steady-state sync: nothing changed, cost should not scale with the corpus
+    since = datetime.now(timezone.utc).isoformat()
+    response = benchmark(client.get, '/changes', query_string={'since': since})
+    assert response.status_code == 200
+
+
+def test_changes_report_deletes(api, client):
+    since = datetime.now(timezone.utc).isoformat()
+    with api.app.app_context():
+        link = api.ResearchAuthor.query.first()
+        key = {'research_id': link.research_id, 'author_id': link.author_id}
+        api.db.session.delete(link)
+        api.db.session.commit()
+    body = client.get('/changes', query_string={'since': since}).get_json()
+    assert key in body['research_authors']['deletes']
+
+
+@pytest.mark.benchmark(group='api')
+def test_research_page_deep(benchmark, api, client):
+    # Keyset paging: the last page should cost about the same as the first
+    total = client.get('/researches/page?limit=1').get_json()['total']
+    cursor = api.encode_cursor([total - 25, total - 25])
+    response = benchmark(client.get, '/researches/page', query_string={'limit': 25, 'cursor': cursor})
+    assert len(response.get_json()['rows']) == 25
+
+
+@pytest.mark.parametrize('values', [[5, 5], [{'a': 1}, 5], ['x', 'y']], ids=['id-cursor', 'dict', 'string-id'])
+def test_research_page_rejects_foreign_cursor(api, client, values):
+    query_string = {'sort': 'title_of_research', 'cursor': api.encode_cursor(values)}
+    assert client.get('/researches/page', query_string=query_string).status_code == 400
+
+
+def test_rollup_totals_add_up(client):
+    body = client.get('/rollup').get_json()
+    by_campus = Counter()
+    for cell in body['cells']:
+        by_campus[cell['camp_id'], cell['school_year']] += cell['papers']
+    assert {(row['camp_id'], row['school_year']): row['papers'] for row in body['campus_totals']} == dict(by_campus)
+    assert None in {campus for campus, _ in by_campus}  # The synthetic college without a campus
+    by_year = Counter()
+    for row in body['campus_totals']:
+        by_year[row['school_year']] += row['papers']
+    assert {row['school_year']: row['papers'] for row in body['year_totals']} == dict(by_year)
+
+
+@pytest.mark.benchmark(group='api-export')
+@pytest.mark.parametrize('export_format', ['csv', 'xlsx'])
+def test_export(benchmark, api, client, export_format):
+    if export_format == 'xlsx' and api.xlsxwriter is None:
+        pytest.skip('xlsxwriter is not installed')
+    response = benchmark(client.get, '/export', query_string={'format': export_format, 'year_from': 2010})
+    assert response.status_code == 200
+    if export_format == 'csv':
+        assert response.data.startswith(b'\xef\xbb\xbf')
+    benchmark.extra_info['bytes'] = len(response.data)
+
+
+@pytest.mark.benchmark(group='api-encodings')
+@pytest.mark.parametrize('encoding', ENCODINGS)
+@pytest.mark.parametrize('route', BULK_ROUTES)
+def test_bulk_encoding(benchmark, client, route, encoding):
+    response = benchmark(client.get, route, headers=ENCODINGS[encoding])
+    assert response.status_code == 200
+    benchmark.extra_info['bytes'] = len(response.data)
+
+
+@pytest.mark.benchmark(group='client-decode')
+@pytest.mark.parametrize('arrow', [False, True], ids=['json', 'arrow'])
+def test_fetch_frame(benchmark, api_url, monkeypatch, arrow):
+    if not arrow:
+        monkeypatch.setattr(api_client, 'pyarrow', None)
+    df = benchmark(api_client.fetch_frame, f"{api_url}/researches")
+    assert not df.empty
@@ -0,0 +1,120 @@
+import random
+
+import pandas as pd
+import pytest
+
+from author_resolution import AuthorIndex, NameCanonicalizer, canonical_names, parse_name
+from author_search import AuthorSearchIndex
+from preprocessing import split_authors
+from synthetic_data import FIRST_NAMES, letters
+
+
+def name_variants(count, seed=0):
+    # Each synthetic author shows up spelled out, abbreviated and surname-first
+    rng = random.Random(seed)
+    names = []
+    for i in range(count):
+        given, surname = rng.choice(FIRST_NAMES), f"Sur{letters(i % (count // 3 or 1))}"
+        names.append(rng.choice([
+            f"{given} {surname}",
+            f"{given[0]}. {surname}",
+            f"{surname}, {given}",
+            f"{given} {rng.choice('ABCDEFG')}. {surname}",
+        ]))
+    return names
+
+
+def test_parse_surname_first():
+    assert parse_name("Cruz, Juan") == ('cruz', ('juan',))
+    assert parse_name("Dela Cruz, J.M.") == ('delacruz', ('j', 'm'))
+    assert parse_name("Juan Dela Cruz") == ('delacruz', ('juan',))
+
+
+def test_ambiguous_initial_stays_unresolved():
+    index = AuthorIndex()
+    index.add(1, "Juan Cruz")
+    index.add(2, "Jose Cruz")
+    assert index.resolve("J. Cruz") is None
+    assert index.resolve("Cruz, Juan") == 1
+    assert index.resolve("Cruz, Jose") == 2
+
+
+def test_close_spellings_are_not_merged():
+    index = AuthorIndex()
+    index.add(1, "Juan Cruz")
+    index.add(2, "Ana Reyes")
+    for raw, author_id in (("Juana Cruz", 1), ("Anna Reyes", 2)):
+        assert index.resolve(raw) is None
+        assert index.near_misses(raw) == [author_id]
+    names = pd.Series(["Juan Cruz", "Juana Cruz", "Ana Reyes", "Anna Reyes", "Mark Santos", "Marko Santos"])
+    assert canonical_names(names).tolist() == names.tolist()
+
+
+def test_distinct_author_ids_stay_apart():
+    canonicalizer = NameCanonicalizer()
+    names = pd.Series(["Juan Cruz", "J. Cruz"])
+    assert canonicalizer.canonicalize(names, pd.Series([1, 2])).tolist() == ["Juan Cruz", "J. Cruz"]
+    # Within one author "J. Cruz" is unambiguous even though another author is Jose Cruz
+    names = pd.Series(["Juan Cruz", "J. Cruz", "Jose Cruz"])
+    assert canonicalizer.canonicalize(names, pd.Series([3, 3, 4])).tolist() == ["Juan Cruz", "Juan Cruz", "Jose Cruz"]
+
+
+def split_cell(cell):
+    return split_authors(pd.DataFrame({'Authors': [cell]}), 'Authors')['Authors'].tolist()
+
+
+def test_split_keeps_surname_first_pairs():
+    assert split_cell("Cruz, Juan, Ana Reyes") == ["Cruz, Juan", "Ana Reyes"]
+    assert split_cell("Juan Cruz, Ana Reyes") == ["Juan Cruz", "Ana Reyes"]
+    assert split_cell("Dela Cruz, J.M., Reyes, A.") == ["Dela Cruz, J.M.", "Reyes, A."]
+    assert split_cell("Ana Reyes; Cruz, Juan Miguel ") == ["Ana Reyes", "Cruz, Juan Miguel"]
+    assert split_cell("Juan Cruz, Jr., Ana Reyes,") == ["Juan Cruz, Jr.", "Ana Reyes"]
+
+
+def test_split_and_canonicalize_cell():
+    df = pd.DataFrame({'Authors': ["Cruz, Juan\nJ. Cruz", "Juan Cruz, Ana Reyes"], 'paper': [1, 2]})
+    split = split_authors(df, 'Authors')
+    assert split['Authors'].tolist() == ["Cruz, Juan", "J. Cruz", "Juan Cruz", "Ana Reyes"]
+    split['Authors'] = canonical_names(split['Authors'])
+    assert split['Authors'].nunique() == 2
+    assert split.loc[split['Authors'] != "Ana Reyes", 'paper'].tolist() == [1, 1, 2]
+    assert "Juan" not in set(split['Authors'])
+
+
+@pytest.mark.benchmark(group='author-resolution')
+@pytest.mark.parametrize('count', [10_000, 50_000])
+def test_canonical_names(benchmark, count):
+    names = pd.Series(name_variants(count))
+    result = benchmark(canonical_names, names)
+    assert result.nunique() < names.nunique()
+
+
+@pytest.mark.benchmark(group='author-resolution')
+def test_resolve_against_index(benchmark):
+    index = AuthorIndex()
+    for author_id, name in enumerate(name_variants(20_000, seed=1)):
+        index.add(author_id, name)
+    raw = name_variants(50_000, seed=2)
+
+    def resolve_all():
+        index._cache.clear()
+        return [index.resolve(name) for name in raw]
+
+    benchmark(resolve_all)
+
+
+@pytest.mark.benchmark(group='api')
+def test_resolve_endpoint(benchmark, client):
+    names = name_variants(5_000)
+    response = benchmark(client.post, '/authors/resolve', json={'names': names})
+    assert response.status_code == 200
+    body = response.get_json()
+    assert set(body['review']) <= {name for name, author_id in body['resolved'].items() if author_id is None}
+
+
+@pytest.mark.benchmark(group='author-search')
+@pytest.mark.parametrize('query', ['sur', 'surabc', 'juan surab', 'surabcc'])
+def test_search_index(benchmark, query):
+    index = AuthorSearchIndex(enumerate(name_variants(50_000)))
+    results = benchmark(index.search, query, 20)
+    assert len(results) <= 20
@@ -0,0 +1,145 @@
+import importlib
+import time
+
+import pandas as pd
+import pytest
+import requests
+
+
+def busiest(names):
+    return names.value_counts().index[0]
+
+
+@pytest.fixture(scope='module')
+def author_app(api_url):
+    return importlib.import_module('AuthorApp')
+
+
+@pytest.fixture(scope='module')
+def author_dashboard(api_url):
+    return importlib.import_module('dashboard')
+
+
+@pytest.fixture(scope='module')
+def workbook_dashboard(workbook):
+    return importlib.import_module('dashboard3')
+
+
+@pytest.fixture(scope='module')
+def department_app(api_url):
+    return importlib.import_module('departmentApp')
+
+
+@pytest.fixture(scope='module')
+def rollup_app(api_url):
+    return importlib.import_module('rollupApp')
+
+
+@pytest.mark.benchmark(group='callbacks')
+def test_author_app_update_graphs(benchmark, author_app):
+    years = author_app.available_school_years
+    result = benchmark(author_app.update_graphs, busiest(author_app.df['name']), years[0], years[-1])
+    assert result[-1] == {'display': 'block'}
+
+
+def test_author_app_refresh_matches_rebuild(author_app, api, monkeypatch):
+    # Delete a paper with its links, drop one link of another paper and edit a third paper
+    paper_ids = [int(paper_id) for paper_id in author_app.df['research_id'].drop_duplicates()[:3]]
+    with api.app.app_context():
+        session = api.db.session
+        for link in api.ResearchAuthor.query.filter_by(research_id=paper_ids[0]):
+            session.delete(link)
+        session.delete(api.ResearchData.query.filter_by(id=paper_ids[0]).one())
+        session.delete(api.ResearchAuthor.query.filter_by(research_id=paper_ids[1]).first())
+        api.ResearchData.query.filter_by(id=paper_ids[2]).one().title_of_research += " (revised)"
+        session.commit()
+
+    monkeypatch.setattr(author_app, 'last_refresh', time.monotonic() - author_app.REFRESH_SECONDS)
+    author_app.refresh_data()
+
+    # The patched frame must equal one rebuilt from the synced tables
+    expected = author_app.build_frame(author_app.tables.frames['research_authors'])
+    assert set(author_app.df.columns) == set(expected.columns)
+    order = ['research_id', 'author_id', 'name']
+    patched = author_app.df[list(expected.columns)].sort_values(order).reset_index(drop=True)
+    pd.testing.assert_frame_equal(patched, expected.sort_values(order).reset_index(drop=True), check_dtype=False)
+    assert paper_ids[0] not in set(patched['research_id'])
+    assert (patched.loc[patched['research_id'] == paper_ids[2], 'title_of_research'].str.endswith(" (revised)")).all()
+
+
+@pytest.mark.benchmark(group='callbacks')
+def test_dashboard_update_visuals(benchmark, author_dashboard, client):
+    author_id = busiest(pd.DataFrame(client.get('/research_authors').get_json())['author_id'])
+    result = benchmark(author_dashboard.update_visuals, int(author_id))
+    assert len(result) == 4
+
+
+@pytest.mark.benchmark(group='callbacks')
+@pytest.mark.parametrize('page', [0, 3])
+def test_dashboard_update_research_table(benchmark, author_dashboard, page):
+    sort_by = [{'column_id': 'school_year', 'direction': 'desc'}]
+    # Only the first page's cursor is known, so page 3 is walked up to
+    cursors = {'key': [['author_id', 1], ['sort', '-school_year']], 'pages': [None], 'page_count': 1}
+    result = benchmark(author_dashboard.update_research_table, 1, page, sort_by, '', cursors)
+    assert len(result[0]) <= author_dashboard.PAGE_SIZE
+
+
+@pytest.mark.benchmark(group='callbacks')
+def test_dashboard3_update_graphs(benchmark, workbook_dashboard):
+    years = workbook_dashboard.available_school_years
+    result = benchmark(workbook_dashboard.update_graphs, busiest(workbook_dashboard.df['Authors']), years[0], years[-1])
+    assert len(result) == 4
+
+
+@pytest.mark.benchmark(group='callbacks')
+@pytest.mark.parametrize('selection', [(1, None, None), (1, 1, None), (1, 1, 1)], ids=['campus', 'college', 'program'])
+def test_department_app_update_charts(benchmark, department_app, selection):
+    result = benchmark(department_app.update_charts, *selection)
+    assert result[-1] == {'display': 'block'}
+    assert all(figure['data'] for figure in result[:3])
+
+
+def test_hierarchy_index_ttl_and_retry(department_app, api_url, monkeypatch):
+    clock, calls, failing = [1000.0], [], [False]
+    real_get = requests.get
+
+    def get(url, **kwargs):
+        calls.append(url)
+        if failing[0]:
+            raise requests.exceptions.ConnectionError(url)
+        return real_get(url, **kwargs)
+
+    monkeypatch.setattr(department_app.time, 'monotonic', lambda: clock[0])
+    monkeypatch.setattr(department_app.requests, 'get', get)
+    index = department_app.HierarchyIndex(f"{api_url}/hierarchy", ttl=300, retry=30)
+
+    campuses = index.campus_options()
+    assert campuses and index.college_options(campuses[0]['value'])
+    clock[0] += 299
+    index.campus_options()
+    assert len(calls) == 1  # Still within the TTL
+
+    # A failed refresh keeps the old tree and waits out the retry delay before trying again
+    clock[0] += 1
+    failing[0] = True
+    assert index.campus_options() == campuses
+    clock[0] += 29
+    index.campus_options()
+    assert len(calls) == 2
+    clock[0] += 1
+    failing[0] = False
+    assert index.campus_options() == campuses
+    assert len(calls) == 3
+    clock[0] += 299
+    index.campus_options()
+    assert len(calls) == 3
+
+
+@pytest.mark.benchmark(group='callbacks')
+@pytest.mark.parametrize('level', ['college', 'campus'])
+def test_rollup_app_update_heatmap(benchmark, rollup_app, client, level):
+    result = benchmark(rollup_app.update_heatmap, level)
+    rows = set(result.data[0].y)
+    campuses = set(client.get('/rollup').get_json()['campuses'].values())
+    # Every row is labelled with a known campus; the college without one is "Unassigned"
+    assert {row.split(' / ')[0] for row in rows} == campuses | {'Unassigned'}
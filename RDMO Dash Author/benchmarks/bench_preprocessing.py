@@ -0,0 +1,144 @@
+"""Compare the old row-wise ingest with preprocessing.py on a synthetic workbook.
+
+    python benchmarks/bench_preprocessing.py --rows 500000
+
+The workbook is written once and reused on later runs; reading it is timed
+separately since it is the same for both pipelines. Under pytest both
+pipelines are also timed on the suite's (smaller) synthetic workbook.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from preprocessing import publication_years, school_year_labels, split_authors  # noqa: E402
+from synthetic_data import letters  # noqa: E402
+
+DATE_STYLES = ('%Y-%m-%d', '%m/%d/%Y', '%B %d, %Y', '%b %Y', '%Y')
+
+
+def make_workbook(path, rows, seed=0):
+    rng = np.random.default_rng(seed)
+    surnames = np.array([f"Sur{letters(i)}" for i in range(2000)])
+    initials = np.array(list("ABCDEFGHIJKLMNOPQRSTUVWXYZ"))
+    dates = pd.to_datetime('2007-01-01') + pd.to_timedelta(rng.integers(0, 18 * 365, rows), unit='D')
+    styles = rng.integers(0, len(DATE_STYLES), rows)
+    date_text = np.empty(rows, dtype=object)
+    for i, fmt in enumerate(DATE_STYLES):
+        mask = styles == i
+        date_text[mask] = dates[mask].strftime(fmt)
+
+    per_paper = rng.integers(1, 6, rows)
+    seps = np.array([", ", ",", "\n", " ,\n"])
+    authors = [
+        rng.choice(seps).join(f"{rng.choice(initials)}. {rng.choice(surnames)}" for _ in range(n))
+        for n in per_paper
+    ]
+
+    pd.DataFrame({
+        'Authors': authors,
+        'College': rng.choice([f"College {i}" for i in range(12)], rows),
+        'Program': rng.choice([f"Program {i}" for i in range(60)], rows),
+        'Date of Publication': date_text,
+        'Title of Research': [f"Research paper {i}" for i in range(rows)],
+    }).to_excel(path, index=False)
+
+
+def legacy_pipeline(df):
+    # Mirrors the ingest code in dashboard3.py before preprocessing.py existed
+    df = df.copy()
+    df['Authors'] = df['Authors'].astype(str).str.split(r'[\n,]')
+    df = df.explode('Authors')
+    df['Authors'] = df['Authors'].str.strip()
+    df['Year'] = pd.to_datetime(df['Date of Publication'], errors='coerce').dt.year
+    df = df.dropna(subset=['Year'])
+    df['Year'] = df['Year'].astype(int)
+    df['School Year'] = df['Year'].apply(lambda year: f"SY {year}-{year + 1}")
+    return df
+
+
+def vectorized_pipeline(df):
+    df = df.copy()
+    df['Year'] = publication_years(df['Date of Publication'])
+    df = df.dropna(subset=['Year'])
+    df['Year'] = df['Year'].astype(int)
+    df['School Year'] = school_year_labels(df['Year'])
+    return split_authors(df, 'Authors')
+
+
+def timed(label, func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<24}{elapsed:>10.2f}s")
+    return result, elapsed
+
+
+@pytest.fixture(scope='module')
+def raw_workbook(workbook):
+    return pd.read_excel(workbook)
+
+
+@pytest.mark.benchmark(group='preprocessing')
+def test_legacy_pipeline(benchmark, raw_workbook):
+    benchmark(legacy_pipeline, raw_workbook)
+
+
+@pytest.mark.benchmark(group='preprocessing')
+def test_vectorized_pipeline(benchmark, raw_workbook):
+    result = benchmark(vectorized_pipeline, raw_workbook)
+    assert result['Title of Research'].nunique() == len(raw_workbook)
+
+
+def best_of(label, func, *args, repeat=3):
+    return min(timed(label, func, *args)[1] for _ in range(repeat))
+
+
+# The new pipeline does more per cell (surname-first pairs, mixed date formats)
+# but must stay within a small factor of the plain comma split it replaced
+MAX_SLOWDOWN = 2.5
+
+
+def test_vectorized_pipeline_keeps_pace(raw_workbook):
+    legacy = best_of("legacy pipeline", legacy_pipeline, raw_workbook)
+    vectorized = best_of("vectorized pipeline", vectorized_pipeline, raw_workbook)
+    assert vectorized <= MAX_SLOWDOWN * legacy, f"{vectorized:.2f}s vs legacy {legacy:.2f}s"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=500_000)
+    parser.add_argument('--workbook', default=None, help="Path of the synthetic .xlsx (default: benchmarks/synthetic_<rows>.xlsx)")
+    args = parser.parse_args()
+
+    path = args.workbook or os.path.join(os.path.dirname(os.path.abspath(__file__)), f"synthetic_{args.rows}.xlsx")
+    if not os.path.exists(path):
+        timed("write workbook", make_workbook, path, args.rows)
+
+    raw, _ = timed("read workbook", pd.read_excel, path)
+    legacy, legacy_time = timed("legacy pipeline", legacy_pipeline, raw)
+    vectorized, vectorized_time = timed("vectorized pipeline", vectorized_pipeline, raw)
+
+    # Every paper must keep its year; the legacy parser drops mixed formats it cannot infer
+    papers = vectorized.drop_duplicates('Title of Research')
+    assert len(papers) == len(raw), f"{len(raw) - len(papers)} papers lost their publication year"
+    assert (vectorized['Authors'] != '').all()
+
+    # Where the legacy pipeline did produce a year, both must agree
+    legacy_years = legacy.drop_duplicates('Title of Research').set_index('Title of Research')['Year']
+    new_years = papers.set_index('Title of Research')['Year']
+    assert (new_years.loc[legacy_years.index] == legacy_years).all()
+
+    assert vectorized_time <= MAX_SLOWDOWN * legacy_time, "vectorized pipeline fell behind the legacy one"
+
+    print(f"{'rows in / out':<24}{len(raw):>10} / {len(vectorized)} (legacy kept {len(legacy)})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""Shared fixtures for the benchmark suite (needs pytest-benchmark).
+
+Run from this directory so results land in benchmarks/results/:
+
+    python -m pytest --synthetic-papers 50000
+    python -m pytest --benchmark-compare          # diff against the last saved run
+
+Each run is saved as JSON under results/<machine>/. Without --database-url the
+API is backed by a throwaway SQLite file; a URL given here (e.g. a scratch
+local PostgreSQL database) is dropped and repopulated.
+"""
+import os
+import sys
+import threading
+
+import pytest
+from werkzeug.serving import make_server
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from synthetic_data import Sizes, populate  # noqa: E402
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('synthetic data')
+    group.addoption('--database-url', default=None, help="Scratch database to populate (default: temporary SQLite)")
+    for name, default in vars(Sizes()).items():
+        group.addoption(f"--synthetic-{name.replace('_', '-')}", type=int, default=default)
+
+
+@pytest.fixture(scope='session', autouse=True)
+def snapshot_dir(tmp_path_factory):
+    # Keep snapshots rendered from a real database out of the callback timings
+    path = tmp_path_factory.mktemp('snapshots')
+    os.environ['RDMO_SNAPSHOT_DIR'] = str(path)
+    return path
+
+
+@pytest.fixture(scope='session')
+def sizes(request):
+    return Sizes(**{name: request.config.getoption(f"synthetic_{name}") for name in vars(Sizes())})
+
+
+@pytest.fixture(scope='session')
+def api(request, sizes, tmp_path_factory):
+    url = request.config.getoption('database_url') or f"sqlite:///{tmp_path_factory.mktemp('db') / 'bench.db'}"
+    os.environ['DATABASE_URL'] = url
+    import api as api_module
+
+    with api_module.app.app_context():
+        api_module.db.drop_all()
+        api_module.db.create_all()
+        populate(api_module, sizes)
+    return api_module
+
+
+@pytest.fixture(scope='session')
+def client(api):
+    return api.app.test_client()
+
+
+@pytest.fixture(scope='session')
+def api_url(api):
+    # The Dash apps talk to the API over HTTP (some of them at import time)
+    server = make_server('127.0.0.1', 0, api.app, threaded=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{server.server_port}"
+    os.environ['RDMO_API_URL'] = url
+    yield url
+    server.shutdown()
+
+
+@pytest.fixture(scope='session')
+def workbook(sizes, tmp_path_factory):
+    from bench_preprocessing import make_workbook
+
+    path = tmp_path_factory.mktemp('workbook') / 'research.xlsx'
+    make_workbook(path, sizes.papers)
+    os.environ['RDMO_WORKBOOK'] = str(path)
+    return path
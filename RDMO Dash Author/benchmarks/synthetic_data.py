@@ -0,0 +1,151 @@
+"""Populate the api.py schema with synthetic data for benchmarking.
+
+    python benchmarks/synthetic_data.py --database-url sqlite:///bench.db --papers 50000
+
+Any SQLAlchemy URL works, e.g. a scratch local PostgreSQL database. The URL
+is handed to api.py through DATABASE_URL, so set it before api is imported.
+"""
+import argparse
+import datetime
+import os
+import random
+import sys
+from dataclasses import dataclass
+
+from sqlalchemy import insert
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+DATE_STYLES = ('%Y-%m-%d', '%m/%d/%Y', '%B %d, %Y', '%b %Y', '%Y')
+RESEARCH_TYPES = ('Journal Article', 'Conference Paper', 'Book Chapter', 'Thesis')
+INDEXING = ('Scopus', 'Web of Science', 'ACI', 'Google Scholar', None)
+FIRST_NAMES = ('Juan', 'Maria', 'Jose', 'Ana', 'Mark', 'Grace', 'Paolo', 'Liza', 'Ramon', 'Carla')
+
+
+@dataclass
+class Sizes:
+    authors: int = 1000
+    papers: int = 10000
+    authors_per_paper: int = 3
+    campuses: int = 2
+    colleges: int = 8
+    programs: int = 40
+
+
+def letters(i):
+    # Digits are stripped when names are normalized, so synthetic surnames must be letters only
+    word = ''
+    while True:
+        i, r = divmod(i, 26)
+        word += 'abcdefghijklmnopqrstuvwxyz'[r]
+        if not i:
+            return word.capitalize()
+
+
+def _batched(rows, size=5000):
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+def populate(api, sizes, seed=0):
+    """Insert a synthetic dataset of the given ``sizes`` and return the row counts.
+
+    ``api`` is the imported api module; call this inside ``api.app.app_context()``.
+    """
+    rng = random.Random(seed)
+
+    campuses = [{'camp_id': i, 'camp_name': f"Campus {i}"} for i in range(1, sizes.campuses + 1)]
+    colleges = [
+        {'id': i, 'college_name': f"College {i}", 'campus_id': campuses[(i - 1) % len(campuses)]['camp_id']}
+        for i in range(1, sizes.colleges + 1)
+    ]
+    if len(colleges) > len(campuses):
+        # Like a college the hierarchy migration could not backfill
+        colleges[-1]['campus_id'] = None
+    programs = [
+        {'id': i, 'program_name': f"Program {i}", 'college_id': colleges[(i - 1) % len(colleges)]['id']}
+        for i in range(1, sizes.programs + 1)
+    ]
+    authors = [
+        {
+            'id': i,
+            'author_name': f"{rng.choice(FIRST_NAMES)} Sur{letters(i)}",
+            'campus_id': rng.choice(campuses)['camp_id'],
+        }
+        for i in range(1, sizes.authors + 1)
+    ]
+
+    papers, links = [], []
+    start_date = datetime.date(2007, 1, 1)
+    for i in range(1, sizes.papers + 1):
+        program = rng.choice(programs)
+        published = start_date + datetime.timedelta(days=rng.randrange(18 * 365))
+        # Vary the count around the requested mean so frames are not perfectly uniform
+        count = max(1, min(len(authors), round(rng.gauss(sizes.authors_per_paper, 1))))
+        paper_authors = rng.sample(authors, count)
+        papers.append({
+            'id': i,
+            'school_year': f"SY {published.year}-{published.year + 1}",
+            'type_of_research': rng.choice(RESEARCH_TYPES),
+            'title_of_research': f"Synthetic research paper {i}",
+            'abstract': f"Abstract of synthetic paper {i}. " * 20,
+            'keywords': ', '.join(f"keyword{rng.randrange(200)}" for _ in range(4)),
+            'doi': f"10.5555/synthetic.{i}",
+            'full_manuscript': None,
+            'journal_publisher': f"Journal {rng.randrange(150)}",
+            'date_of_publication': published.strftime(rng.choice(DATE_STYLES)),
+            'indexing': rng.choice(INDEXING),
+            'apa_format': f"Author, A. ({published.year}). Synthetic research paper {i}. Journal.",
+            'college_id': program['college_id'],
+            'program_id': program['id'],
+            'authors': ', '.join(a['author_name'] for a in paper_authors)[:255],
+        })
+        links.extend({'research_id': i, 'author_id': a['id']} for a in paper_authors)
+
+    for model, rows in (
+        (api.Campus, campuses),
+        (api.College, colleges),
+        (api.Program, programs),
+        (api.Author, authors),
+        (api.ResearchData, papers),
+        (api.ResearchAuthor, links),
+    ):
+        for batch in _batched(rows):
+            api.db.session.execute(insert(model), batch)
+    api.db.session.commit()
+
+    return {
+        'campuses': len(campuses),
+        'colleges': len(colleges),
+        'programs': len(programs),
+        'authors': len(authors),
+        'papers': len(papers),
+        'research_authors': len(links),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--database-url', required=True)
+    parser.add_argument('--reset', action='store_true', help="Drop and recreate all tables first")
+    parser.add_argument('--seed', type=int, default=0)
+    for name, default in vars(Sizes()).items():
+        parser.add_argument(f"--{name.replace('_', '-')}", type=int, default=default)
+    args = parser.parse_args()
+
+    os.environ['DATABASE_URL'] = args.database_url
+    import api
+
+    with api.app.app_context():
+        if args.reset:
+            api.db.drop_all()
+        api.db.create_all()
+        sizes = Sizes(**{name: getattr(args, name) for name in vars(Sizes())})
+        counts = populate(api, sizes, seed=args.seed)
+
+    for table, count in counts.items():
+        print(f"{table:<20}{count:>10}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,44 +1,36 @@
+import math
+import os
+import re
 import dash
-from dash import dcc, html, Input, Output
+from dash import dcc, html, dash_table, Input, Output, State
+from dash.exceptions import PreventUpdate
 import requests
 import pandas as pd
 import plotly.express as px
+import perf
 
 # Define the Flask API base URL
-API_BASE_URL = "http://127.0.0.1:5000"  # Update if hosted elsewhere
+API_BASE_URL = os.environ.get("RDMO_API_URL", "http://127.0.0.1:5000")  # Update if hosted elsewhere
+
+# Most author suggestions shown while typing
+SEARCH_LIMIT = 20
+
+# Rows per page of the research table
+PAGE_SIZE = 25
+
+TABLE_COLUMNS = [
+    {'name': 'Title', 'id': 'title_of_research'},
+    {'name': 'School Year', 'id': 'school_year'},
+    {'name': 'Journal Publisher', 'id': 'journal_publisher'},
+    {'name': 'Date of Publication', 'id': 'date_of_publication'},
+    {'name': 'Indexing', 'id': 'indexing'},
+    {'name': 'DOI', 'id': 'doi'},
+    {'name': 'APA Citation', 'id': 'apa_format'},
+]
 
 # Initialize Dash app
 app = dash.Dash(__name__)
 
-# Fetch data from Flask API
-def fetch_authors():
-    response = requests.get(f"{API_BASE_URL}/authors")
-    return response.json() if response.status_code == 200 else []
-
-def fetch_research():
-    response = requests.get(f"{API_BASE_URL}/researches")
-    return response.json() if response.status_code == 200 else []
-
-# Load initial data
-authors = fetch_authors()
-research_data = fetch_research()
-
-# Convert research data to DataFrame
-df_author = pd.DataFrame(research_data)
-if not df_author.empty:
-    df_author.rename(columns={
-        'title': 'Research Title',
-        'year': 'School Year',
-        'journal_publisher': 'Journal Publisher',
-        'indexing': 'Indexing',
-        'doi': 'DOI',
-        'keywords': 'Keywords'
-    }, inplace=True)
-    df_author.fillna("Unlabeled", inplace=True)  # Replace NaN values with 'Unlabeled'
-
-else:
-    df = pd.DataFrame(columns=['Research Title', 'Faculty Name', 'Program', 'School Year', 'Indexing', 'Journal Publisher', 'DOI', 'Keywords'])
-
 # App layout
 app.layout = html.Div([
     # Top bar
@@ -54,15 +46,34 @@ app.layout = html.Div([
     
     dcc.Dropdown(
         id="author-dropdown",
-        options=[{"label": author["name"], "value": author["id"]} for author in authors],
-        placeholder="Select an Author",
+        options=[],  # Filled from /authors/search as the user types
+        placeholder="Type to search for an author",
         style={'width': '50%', 'margin': 'auto'}
     ),
     
     dcc.Graph(id='research-year-chart'),
     dcc.Graph(id='journal-bar-chart'),
     dcc.Graph(id='indexing-piechart'),
-    dcc.Graph(id='doi-table'),
+    html.Div([
+        dash_table.DataTable(
+            id='research-table',
+            columns=TABLE_COLUMNS,
+            # Paging, sorting and filtering all run in the API; the table only ever holds one page
+            page_action='custom',
+            page_current=0,
+            page_size=PAGE_SIZE,
+            sort_action='custom',
+            sort_mode='single',
+            sort_by=[],
+            filter_action='custom',
+            filter_query='',
+            style_table={'overflowX': 'auto'},
+            style_cell={'textAlign': 'left', 'whiteSpace': 'normal', 'height': 'auto', 'maxWidth': '400px'},
+            style_header={'backgroundColor': '#54473F', 'color': 'white', 'fontWeight': 'bold'}
+        ),
+        # Cursor of every page visited so far, for the current author/sort/filter
+        dcc.Store(id='research-table-cursors', data={})
+    ], style={'margin': '20px'}),
     dcc.Graph(id='keyword-bar-chart'),
     
     # Yellow bottom bar
@@ -70,45 +81,140 @@ app.layout = html.Div([
 ])
 
 # Callbacks
+@app.callback(
+    Output('author-dropdown', 'options'),
+    Input('author-dropdown', 'search_value'),
+    State('author-dropdown', 'value'),
+    State('author-dropdown', 'options')
+)
+def search_authors(search_value, selected_author, current_options):
+    if not search_value:
+        raise PreventUpdate  # Keep the current options (and the selected author's label)
+    try:
+        response = requests.get(f"{API_BASE_URL}/authors/search", params={'q': search_value, 'limit': SEARCH_LIMIT}, timeout=5)
+        response.raise_for_status()
+    except requests.exceptions.RequestException:
+        raise PreventUpdate
+    options = [{'label': author['name'], 'value': author['id']} for author in response.json()]
+    # The selected author must stay in the options or the dropdown loses its label
+    if selected_author is not None and all(option['value'] != selected_author for option in options):
+        options += [option for option in current_options or [] if option['value'] == selected_author]
+    return options
+
 @app.callback(
     [
         Output('research-year-chart', 'figure'),
         Output('journal-bar-chart', 'figure'),
         Output('indexing-piechart', 'figure'),
-        Output('doi-table', 'figure'),
         Output('keyword-bar-chart', 'figure')
     ],
     [Input('author-dropdown', 'value')]
 )
+@perf.profiled
 def update_visuals(author_id):
     if not author_id:
-        return px.bar(), px.bar(), px.pie(), px.bar(), px.bar()
-    
-    author_research = requests.get(f"{API_BASE_URL}/author_research/{author_id}").json()
-    df_author = pd.DataFrame(author_research)
-    
-    if df_author.empty:
-        return px.bar(), px.bar(), px.pie(), px.bar(), px.bar()
-
-    df_author.fillna("Unlabeled", inplace=True)  # Replace NaN values with 'Unlabeled'
-    
-    # Research count per publication year
-    fig1 = px.bar(df_author, x='year', title="Research Count by Year of Publication")
-
-    # Research per journal publisher
-    fig2 = px.bar(df_author, x='journal_publisher', title="Research Published per Journal")
-
-    # Scopus indexing pie chart
-    fig3 = px.pie(df_author, names='indexing', title="Research Indexing Distribution")
+        return px.bar(), px.bar(), px.pie(), px.bar()
 
-    # DOI table
-    fig4 = px.bar(df_author, x='doi', y='title', title="DOI per Research")
+    with perf.stage('fetch'):
+        author_research = requests.get(f"{API_BASE_URL}/author_research/{author_id}").json()
+        df_author = pd.DataFrame(author_research)
 
-    # Keywords bar chart
-    df_author['keywords'] = df_author['keywords'].apply(lambda x: x.split(',') if isinstance(x, str) else ["Unlabeled"])
-    fig5 = px.bar(df_author.explode('keywords'), x='keywords', title="Keywords per Research")
+    if df_author.empty:
+        return px.bar(), px.bar(), px.pie(), px.bar()
+
+    with perf.stage('aggregate'):
+        df_author.fillna("Unlabeled", inplace=True)  # Replace NaN values with 'Unlabeled'
+        df_keywords = df_author.assign(
+            keywords=df_author['keywords'].apply(lambda x: x.split(',') if isinstance(x, str) else ["Unlabeled"])
+        ).explode('keywords')
+
+    with perf.stage('figures'):
+        # Research count per publication year
+        fig1 = px.bar(df_author, x='year', title="Research Count by Year of Publication")
+
+        # Research per journal publisher
+        fig2 = px.bar(df_author, x='journal_publisher', title="Research Published per Journal")
+
+        # Scopus indexing pie chart
+        fig3 = px.pie(df_author, names='indexing', title="Research Indexing Distribution")
+
+        # Keywords bar chart
+        fig4 = px.bar(df_keywords, x='keywords', title="Keywords per Research")
+
+    return fig1, fig2, fig3, fig4
+
+# "{doi} contains 10.55" / "{title_of_research} contains 'deep learning'" parts of a filter_query
+FILTER_PART = re.compile(r"\{(\w+)\}\s+\S+\s+(?:\"(.*)\"|'(.*)'|(.*))$")
+
+def table_filters(filter_query):
+    # Every column filter becomes a case-insensitive substring match in the API
+    params = {}
+    for part in filter_query.split(' && ') if filter_query else []:
+        match = FILTER_PART.match(part.strip())
+        if match:
+            column = match.group(1)
+            text = next(g for g in match.groups()[1:] if g is not None)
+            params[f"contains.{column}"] = text
+    return params
+
+def fetch_table_page(params, cursor):
+    response = requests.get(
+        f"{API_BASE_URL}/researches/page",
+        params={**params, 'limit': PAGE_SIZE, **({'cursor': cursor} if cursor else {})},
+        timeout=10
+    )
+    response.raise_for_status()
+    return response.json()
 
-    return fig1, fig2, fig3, fig4, fig5
+@app.callback(
+    Output('research-table', 'data'),
+    Output('research-table', 'page_count'),
+    Output('research-table', 'page_current'),
+    Output('research-table-cursors', 'data'),
+    Input('author-dropdown', 'value'),
+    Input('research-table', 'page_current'),
+    Input('research-table', 'sort_by'),
+    Input('research-table', 'filter_query'),
+    State('research-table-cursors', 'data')
+)
+@perf.profiled
+def update_research_table(author_id, page, sort_by, filter_query, cursors):
+    if not author_id:
+        return [], 1, 0, {}
+
+    params = {'author_id': author_id, **table_filters(filter_query)}
+    if sort_by:
+        params['sort'] = ('-' if sort_by[0]['direction'] == 'desc' else '') + sort_by[0]['column_id']
+
+    # A new author, sort or filter starts again from the first page
+    key = [[name, value] for name, value in sorted(params.items())]  # Lists survive the Store's JSON round trip
+    if not cursors or cursors.get('key') != key:
+        cursors = {'key': key, 'pages': [None], 'page_count': 1}
+        page = 0
+    page = page or 0
+
+    try:
+        with perf.stage('fetch'):
+            # Pages are reached through the previous page's cursor; a page number typed into the
+            # pager beyond the pages visited so far is walked up to one page at a time
+            while len(cursors['pages']) <= page:
+                result = fetch_table_page(params, cursors['pages'][-1])
+                if not result['next_cursor']:
+                    break
+                cursors['pages'].append(result['next_cursor'])
+            page = min(page, len(cursors['pages']) - 1)
+            result = fetch_table_page(params, cursors['pages'][page])
+    except requests.exceptions.RequestException:
+        raise PreventUpdate
+
+    if result['total'] is not None:
+        cursors['page_count'] = max(1, math.ceil(result['total'] / PAGE_SIZE))
+    if page + 1 == len(cursors['pages']) and result['next_cursor']:
+        cursors['pages'].append(result['next_cursor'])
+
+    return result['rows'], cursors['page_count'], page, cursors
+
+perf.install(app)
 
 
 
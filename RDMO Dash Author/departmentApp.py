@@ -1,88 +1,199 @@
+import os
 import dash
 from dash import dcc, html
 from dash.dependencies import Input, Output
+import threading
+import time
 import requests
-import pandas as pd
 import plotly.express as px
+import perf
+from api_client import fetch_frame
+from preprocessing import publication_years
+from snapshots import load_snapshot
+
+# Define the Flask API base URL
+API_BASE_URL = os.environ.get("RDMO_API_URL", "http://127.0.0.1:5000")  # Update if hosted elsewhere
+
+# How long the campus/college/program tree is trusted before it is re-fetched
+HIERARCHY_TTL_SECONDS = 300
+
+# After a failed re-fetch the stale tree is served for this long before trying again
+HIERARCHY_RETRY_SECONDS = 30
+
+
+class HierarchyIndex:
+    """In-memory campus -> college -> program index built from /hierarchy.
+
+    Dropdown cascades are answered from plain dict lookups; the API is only
+    hit again once the cached tree is older than ``ttl`` seconds, by one
+    thread while the others keep reading the old tree. If that fails, the
+    old tree is served for another ``retry`` seconds before the next attempt.
+    """
+
+    def __init__(self, url, ttl, retry):
+        self.url = url
+        self.ttl = ttl
+        self.retry = retry
+        self._lock = threading.Lock()
+        self._next_refresh = None  # time.monotonic() deadline; None until a tree is loaded
+        self._campus_options = []
+        self._college_options = {}
+        self._program_options = {}
+        self._college_names = {}
+        self._program_names = {}
+
+    def _refresh(self):
+        response = requests.get(self.url, timeout=10)
+        response.raise_for_status()
+
+        campus_options, college_options, program_options = [], {}, {}
+        college_names, program_names = {}, {}
+        for campus in response.json():
+            campus_options.append({'label': campus['camp_name'], 'value': campus['camp_id']})
+            college_options[campus['camp_id']] = [
+                {'label': college['college_name'], 'value': college['id']} for college in campus['colleges']
+            ]
+            for college in campus['colleges']:
+                college_names[college['id']] = college['college_name']
+                program_names.update((program['id'], program['program_name']) for program in college['programs'])
+                program_options[college['id']] = [
+                    {'label': program['program_name'], 'value': program['id']} for program in college['programs']
+                ]
+
+        # Swap the whole index at once so readers never see a half-built tree
+        self._campus_options, self._college_options, self._program_options = (
+            campus_options, college_options, program_options
+        )
+        self._college_names, self._program_names = college_names, program_names
+
+    def _due(self):
+        return self._next_refresh is None or time.monotonic() >= self._next_refresh
+
+    def _ensure_fresh(self):
+        if not self._due():
+            return
+        # Only the first load makes callers wait; later refreshes never block a lookup
+        if not self._lock.acquire(blocking=self._next_refresh is None):
+            return
+        try:
+            if not self._due():
+                return
+            try:
+                self._refresh()
+            except requests.exceptions.RequestException:
+                if self._next_refresh is None:
+                    raise
+                # Keep serving the last good tree without a request per click until the retry delay passes
+                self._next_refresh = time.monotonic() + self.retry
+                return
+            self._next_refresh = time.monotonic() + self.ttl
+        finally:
+            self._lock.release()
+
+    def campus_options(self):
+        self._ensure_fresh()
+        return self._campus_options
+
+    def college_options(self, campus_id):
+        self._ensure_fresh()
+        return self._college_options.get(campus_id, [])
+
+    def program_options(self, college_id):
+        self._ensure_fresh()
+        return self._program_options.get(college_id, [])
+
+    def college_names(self):
+        self._ensure_fresh()
+        return self._college_names
+
+    def program_names(self):
+        self._ensure_fresh()
+        return self._program_names
+
+
+hierarchy = HierarchyIndex(f"{API_BASE_URL}/hierarchy", HIERARCHY_TTL_SECONDS, HIERARCHY_RETRY_SECONDS)
+
+
+def campus_dropdown_options():
+    try:
+        return hierarchy.campus_options()
+    except requests.exceptions.RequestException:
+        return []
+
 
 # Initialize Dash app
 app = dash.Dash(__name__)
 
-app.layout = html.Div([
-    # Top bar
-    html.Div([
-        html.Img(src="/assets/TIPLogo.jpg", style={
-            'height': '80px',
-            'margin-left': '20px',
-            'margin-top': '10px'
-        }),
-        html.Div(style={
-            'margin-left': '30px',
-            'display': 'flex',
-            'flexDirection': 'column',
-            'justify-content': 'center'
-        }, children=[
-            html.Span("Academic Research Unit", style={'font-size': '24px', 'color': 'white'}),
-            html.Span("Technological Institute of the Philippines", style={'font-size': '16px', 'color': 'white', 'margin-top': '5px'})
-        ])
-    ], style={'backgroundColor': '#333333', 'height': '140px', 'display': 'flex', 'align-items': 'center'}),
-
-    # Main content container
-    html.Div([
-        # Header
-        html.H1("Department Profile", style={'text-align': 'left', 'margin-left': '20px', 'margin-bottom': '20px', 'font-size': '2.5em', 'color': '#54473F'}),
-
-        # Dropdowns
+# Build the layout per page load so the campus list comes from the index, not a callback
+def serve_layout():
+    return html.Div([
+        # Top bar
         html.Div([
-            html.Div([
-                html.Label("Campus:", style={'margin-right': '10px', 'font-weight': 'bold', 'color': '#54473F'}),
-                dcc.Dropdown(id='campus-dropdown', options=[], placeholder="Select a campus", style={'width': '300px'})
-            ], style={'margin-bottom': '20px'}),
+            html.Img(src="/assets/TIPLogo.jpg", style={
+                'height': '80px',
+                'margin-left': '20px',
+                'margin-top': '10px'
+            }),
+            html.Div(style={
+                'margin-left': '30px',
+                'display': 'flex',
+                'flexDirection': 'column',
+                'justify-content': 'center'
+            }, children=[
+                html.Span("Academic Research Unit", style={'font-size': '24px', 'color': 'white'}),
+                html.Span("Technological Institute of the Philippines", style={'font-size': '16px', 'color': 'white', 'margin-top': '5px'})
+            ])
+        ], style={'backgroundColor': '#333333', 'height': '140px', 'display': 'flex', 'align-items': 'center'}),
 
-            html.Div([
-                html.Label("College:", style={'margin-right': '10px', 'font-weight': 'bold', 'color': '#54473F'}),
-                dcc.Dropdown(id='college-dropdown', options=[], placeholder="Select a college", style={'width': '300px'})
-            ], style={'margin-bottom': '20px'}),
+        # Main content container
+        html.Div([
+            # Header
+            html.H1("Department Profile", style={'text-align': 'left', 'margin-left': '20px', 'margin-bottom': '20px', 'font-size': '2.5em', 'color': '#54473F'}),
 
+            # Dropdowns
             html.Div([
-                html.Label("Program:", style={'margin-right': '10px', 'font-weight': 'bold', 'color': '#54473F'}),
-                dcc.Dropdown(id='program-dropdown', options=[], placeholder="Select a program", style={'width': '300px'})
-            ])
-        ], style={'margin-left': '20px'}),
+                html.Div([
+                    html.Label("Campus:", style={'margin-right': '10px', 'font-weight': 'bold', 'color': '#54473F'}),
+                    dcc.Dropdown(id='campus-dropdown', options=campus_dropdown_options(), placeholder="Select a campus", style={'width': '300px'})
+                ], style={'margin-bottom': '20px'}),
 
-        # Visualizations (initially hidden)
-        html.Div(id='visualizations', style={'display': 'none'}, children=[
-            html.Div([
-                dcc.Graph(id='bar-chart'),
-            ], style={'margin-bottom': '30px'}),
+                html.Div([
+                    html.Label("College:", style={'margin-right': '10px', 'font-weight': 'bold', 'color': '#54473F'}),
+                    dcc.Dropdown(id='college-dropdown', options=[], placeholder="Select a college", style={'width': '300px'})
+                ], style={'margin-bottom': '20px'}),
 
-            html.Div([
                 html.Div([
-                    dcc.Graph(id='college-piechart'),
-                ], style={'flex': 1, 'margin': '20px'}),
+                    html.Label("Program:", style={'margin-right': '10px', 'font-weight': 'bold', 'color': '#54473F'}),
+                    dcc.Dropdown(id='program-dropdown', options=[], placeholder="Select a program", style={'width': '300px'})
+                ])
+            ], style={'margin-left': '20px'}),
 
+            # Visualizations (initially hidden)
+            html.Div(id='visualizations', style={'display': 'none'}, children=[
                 html.Div([
-                    dcc.Graph(id='program-piechart'),
-                ], style={'flex': 1, 'margin': '20px'})
-            ], style={'display': 'flex', 'flex-wrap': 'wrap', 'margin': '20px'}),
-        ]),
-    ], style={'flex': 1, 'display': 'flex', 'flexDirection': 'column'}),  # This makes sure the main content area expands to fill available space
+                    dcc.Graph(id='bar-chart'),
+                ], style={'margin-bottom': '30px'}),
 
-    # Yellow bottom bar
-    html.Div(style={'backgroundColor': '#ffcc00', 'height': '80px', 'width': '100%'})
-], style={'display': 'flex', 'flexDirection': 'column', 'minHeight': '100vh'})
+                html.Div([
+                    html.Div([
+                        dcc.Graph(id='college-piechart'),
+                    ], style={'flex': 1, 'margin': '20px'}),
 
+                    html.Div([
+                        dcc.Graph(id='program-piechart'),
+                    ], style={'flex': 1, 'margin': '20px'})
+                ], style={'display': 'flex', 'flex-wrap': 'wrap', 'margin': '20px'}),
+            ]),
+        ], style={'flex': 1, 'display': 'flex', 'flexDirection': 'column'}),  # This makes sure the main content area expands to fill available space
 
-# Callbacks to load dropdown options
-@app.callback(
-    Output('campus-dropdown', 'options'),
-    Input('campus-dropdown', 'value')
-)
-def load_campuses(selected_value):
-    response = requests.get("http://127.0.0.1:5000/campuses")
-    campuses = response.json()
-    return [{'label': campus['camp_name'], 'value': campus['camp_id']} for campus in campuses]
+        # Yellow bottom bar
+        html.Div(style={'backgroundColor': '#ffcc00', 'height': '80px', 'width': '100%'})
+    ], style={'display': 'flex', 'flexDirection': 'column', 'minHeight': '100vh'})
 
+app.layout = serve_layout
+
+
+# Callbacks to load dropdown options (resolved from the in-memory hierarchy index)
 @app.callback(
     Output('college-dropdown', 'options'),
     Input('campus-dropdown', 'value')
@@ -90,9 +201,10 @@ def load_campuses(selected_value):
 def load_colleges(selected_campus):
     if not selected_campus:
         return []
-    response = requests.get(f"http://127.0.0.1:5000/colleges?campus_id={selected_campus}")
-    colleges = response.json()
-    return [{'label': college['college_name'], 'value': college['id']} for college in colleges]
+    try:
+        return hierarchy.college_options(selected_campus)
+    except requests.exceptions.RequestException:
+        return []
 
 @app.callback(
     Output('program-dropdown', 'options'),
@@ -101,9 +213,18 @@ def load_colleges(selected_campus):
 def load_programs(selected_college):
     if not selected_college:
         return []
-    response = requests.get(f"http://127.0.0.1:5000/programs?college_id={selected_college}")
-    programs = response.json()
-    return [{'label': program['program_name'], 'value': program['id']} for program in programs]
+    try:
+        return hierarchy.program_options(selected_college)
+    except requests.exceptions.RequestException:
+        return []
+
+def data_version():
+    try:
+        response = requests.get(f"{API_BASE_URL}/version", timeout=5)
+        response.raise_for_status()
+        return response.json()['version']
+    except requests.exceptions.RequestException:
+        return None
 
 # Callback to update charts
 @app.callback(
@@ -115,10 +236,20 @@ def load_programs(selected_college):
      Input('college-dropdown', 'value'),
      Input('program-dropdown', 'value')]
 )
+@perf.profiled
 def update_charts(selected_campus, selected_college, selected_program):
     if not selected_campus:
         return {}, {}, {}, {'display': 'none'}  # Hide charts if no campus is selected
 
+    # Every campus/college/program selection is pre-rendered by render.py; a snapshot is
+    # used only while the API still serves the data it was rendered from
+    with perf.stage('snapshot'):
+        snapshot = load_snapshot('departments', [selected_campus, selected_college, selected_program], data_version())
+    if snapshot is not None:
+        return snapshot
+    return compute_charts(selected_campus, selected_college, selected_program)
+
+def compute_charts(selected_campus, selected_college, selected_program):
     filters = {'campus_id': selected_campus}
     if selected_college:
         filters['college_id'] = selected_college
@@ -126,64 +257,68 @@ def update_charts(selected_campus, selected_college, selected_program):
         filters['program_id'] = selected_program
 
     try:
-        response = requests.get("http://127.0.0.1:5000/researches", params=filters)
-        response.raise_for_status()
-        researches = response.json()
-
-        if not researches:
-            return {}, {}, {}, {'display': 'none'}  # Hide charts if no data is fetched
-
-        df = pd.DataFrame(researches)
+        with perf.stage('fetch'):
+            df = fetch_frame(f"{API_BASE_URL}/researches", params=filters)
+            if not df.empty:
+                df['college_name'] = df['college_id'].map(hierarchy.college_names())
+                df['program_name'] = df['program_id'].map(hierarchy.program_names())
 
         if df.empty or not {'date_of_publication', 'college_name', 'program_name'}.issubset(df.columns):
             return {}, {}, {}, {'display': 'none'}  # Hide charts if data is incomplete
 
-        # Ensure the 'year' column is in the correct format
-        df['year'] = pd.to_datetime(df['date_of_publication'], errors='coerce').dt.year
-
-        # Filter data to include only years >= 2007
-        df_filtered = df[df['year'] >= 2007]
-
-        # Group by year and count papers for each year
-        papers_by_year = df_filtered.groupby('year').size().reset_index(name='Number of Papers')
-
-        # Remove years with no papers
-        papers_by_year = papers_by_year[papers_by_year['Number of Papers'] > 0]
-
-        # Create bar chart grouped by year
-        bar_chart = px.bar(
-            papers_by_year,
-            x='year',
-            y='Number of Papers',
-            title="Number of Papers by Year",
-            template='plotly_white'
-        ).update_layout(title_x=0.5, title_font_size=20)
-
-        # Pie chart: College distribution
-        college_distribution = df['college_name'].value_counts().reset_index()
-        college_distribution.columns = ['College Name', 'Number of Papers']
-        college_piechart = px.pie(
-            college_distribution,
-            names='College Name',
-            values='Number of Papers',
-            title="College Distribution",
-            template='plotly_white'
-        ).update_layout(title_x=0.5, title_font_size=20).update_traces(textinfo='none', showlegend=True)
-
-        # Pie chart: Program distribution
-        program_distribution = df['program_name'].value_counts().reset_index()
-        program_distribution.columns = ['Program Name', 'Number of Papers']
-        program_piechart = px.pie(
-            program_distribution,
-            names='Program Name',
-            values='Number of Papers',
-            title="Program Distribution",
-            template='plotly_white'
-        ).update_layout(title_x=0.5, title_font_size=20).update_traces(textinfo='none', showlegend=True)
+        with perf.stage('filter'):
+            # Ensure the 'year' column is in the correct format
+            df['year'] = publication_years(df['date_of_publication'])
+
+            # Filter data to include only years >= 2007
+            df_filtered = df[(df['year'] >= 2007).fillna(False)]
+
+        with perf.stage('aggregate'):
+            # Group by year and count papers for each year
+            papers_by_year = df_filtered.groupby('year').size().reset_index(name='Number of Papers')
+
+            # Remove years with no papers
+            papers_by_year = papers_by_year[papers_by_year['Number of Papers'] > 0]
+
+            college_distribution = df['college_name'].value_counts().reset_index()
+            college_distribution.columns = ['College Name', 'Number of Papers']
+
+            program_distribution = df['program_name'].value_counts().reset_index()
+            program_distribution.columns = ['Program Name', 'Number of Papers']
+
+        with perf.stage('figures'):
+            # Create bar chart grouped by year
+            bar_chart = px.bar(
+                papers_by_year,
+                x='year',
+                y='Number of Papers',
+                title="Number of Papers by Year",
+                template='plotly_white'
+            ).update_layout(title_x=0.5, title_font_size=20)
+
+            # Pie chart: College distribution
+            college_piechart = px.pie(
+                college_distribution,
+                names='College Name',
+                values='Number of Papers',
+                title="College Distribution",
+                template='plotly_white'
+            ).update_layout(title_x=0.5, title_font_size=20).update_traces(textinfo='none', showlegend=True)
+
+            # Pie chart: Program distribution
+            program_piechart = px.pie(
+                program_distribution,
+                names='Program Name',
+                values='Number of Papers',
+                title="Program Distribution",
+                template='plotly_white'
+            ).update_layout(title_x=0.5, title_font_size=20).update_traces(textinfo='none', showlegend=True)
 
         return bar_chart, college_piechart, program_piechart, {'display': 'block'}  # Show charts after data is fetched
     except requests.exceptions.RequestException as e:
         return {}, {}, {}, {'display': 'none'}  # Hide charts in case of error
 
+perf.install(app)
+
 if __name__ == '__main__':
     app.run_server(debug=True)
@@ -0,0 +1,163 @@
+"""Opt-in timing of Dash callbacks, broken down by stage.
+
+Enable with RDMO_PERF=1, then wrap callbacks and mark their stages:
+
+    @app.callback(...)
+    @perf.profiled
+    def update_graphs(...):
+        with perf.stage('fetch'):
+            ...
+
+    perf.install(app)  # serves aggregated percentiles on /_perf
+
+Calls slower than RDMO_PERF_SLOW_MS (default 500) are logged with their
+inputs. RDMO_PERF_PROFILE=N also runs calls under cProfile (one at a time;
+overlapping calls are only timed) and keeps the N slowest profiles per
+callback in RDMO_PERF_DIR (default perf_profiles/).
+When RDMO_PERF is unset the decorator returns the callback untouched.
+"""
+import contextlib
+import contextvars
+import cProfile
+import functools
+import heapq
+import itertools
+import logging
+import os
+import threading
+import time
+from collections import defaultdict, deque
+
+from flask import jsonify
+
+ENABLED = os.environ.get('RDMO_PERF', '') not in ('', '0')
+SLOW_MS = float(os.environ.get('RDMO_PERF_SLOW_MS', 500))
+PROFILE_SLOWEST = int(os.environ.get('RDMO_PERF_PROFILE', 0))
+PROFILE_DIR = os.environ.get('RDMO_PERF_DIR', 'perf_profiles')
+
+# Percentiles are computed over the most recent calls only
+WINDOW = 1000
+
+logger = logging.getLogger('rdmo.perf')
+
+_stages = contextvars.ContextVar('perf_stages', default=None)
+_lock = threading.Lock()
+_profiler_lock = threading.Lock()
+_timings = defaultdict(lambda: defaultdict(lambda: deque(maxlen=WINDOW)))
+_slowest_profiles = defaultdict(list)
+_profile_ids = itertools.count()
+
+
+@contextlib.contextmanager
+def stage(name):
+    """Time a block as stage ``name`` of the callback currently running."""
+    stages = _stages.get()
+    if stages is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stages[name] = stages.get(name, 0.0) + (time.perf_counter() - start) * 1000
+
+
+def profiled(func):
+    """Record total and per-stage time of every call to ``func``."""
+    if not ENABLED:
+        return func
+    name = f"{func.__module__}.{func.__name__}"
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        stages = {}
+        token = _stages.set(stages)
+        profiler = _start_profiler() if PROFILE_SLOWEST else None
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            if profiler is not None:
+                profiler.disable()
+                _profiler_lock.release()
+            total = (time.perf_counter() - start) * 1000
+            _stages.reset(token)
+            _record(name, total, stages, args, profiler)
+
+    return wrapper
+
+
+def _start_profiler():
+    # Only one cProfile profiler may be active at a time (Python 3.12+ raises otherwise),
+    # so callbacks running concurrently are timed as usual but only one is profiled
+    if not _profiler_lock.acquire(blocking=False):
+        return None
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:  # Another profiling tool (e.g. a debugger) is active
+        _profiler_lock.release()
+        return None
+    return profiler
+
+
+def _record(name, total, stages, args, profiler):
+    stages['other'] = max(0.0, total - sum(stages.values()))  # time outside any named stage
+    with _lock:
+        _timings[name]['total'].append(total)
+        for stage_name, ms in stages.items():
+            _timings[name][stage_name].append(ms)
+
+    if total >= SLOW_MS:
+        breakdown = ', '.join(f"{stage_name}={ms:.0f}ms" for stage_name, ms in stages.items())
+        logger.warning("Slow callback %s took %.0fms (%s) inputs=%r", name, total, breakdown, args)
+
+    if profiler is not None:
+        _keep_profile(name, total, profiler)
+
+
+def _keep_profile(name, total, profiler):
+    with _lock:
+        heap = _slowest_profiles[name]
+        if len(heap) >= PROFILE_SLOWEST and total <= heap[0][0]:
+            return
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        path = os.path.join(PROFILE_DIR, f"{name}-{next(_profile_ids)}.prof")
+        profiler.dump_stats(path)
+        heapq.heappush(heap, (total, path))
+        if len(heap) > PROFILE_SLOWEST:
+            _, evicted = heapq.heappop(heap)
+            os.remove(evicted)
+
+
+def _percentile(values, q):
+    return values[min(len(values) - 1, round(q / 100 * (len(values) - 1)))]
+
+
+def summary():
+    """Per-callback, per-stage count and p50/p90/p99/max in milliseconds."""
+    with _lock:
+        snapshot = {name: {s: sorted(v) for s, v in stages.items()} for name, stages in _timings.items()}
+        profiles = {name: [path for _, path in sorted(heap, reverse=True)] for name, heap in _slowest_profiles.items()}
+
+    report = {}
+    for name, stages in snapshot.items():
+        report[name] = {
+            stage_name: {
+                'count': len(values),
+                'p50': round(_percentile(values, 50), 2),
+                'p90': round(_percentile(values, 90), 2),
+                'p99': round(_percentile(values, 99), 2),
+                'max': round(values[-1], 2),
+            } for stage_name, values in stages.items()
+        }
+        if name in profiles:
+            report[name]['slowest_profiles'] = profiles[name]
+    return report
+
+
+def install(app):
+    """Expose summary() on the Dash app's /_perf route (only when enabled)."""
+    if not ENABLED:
+        return
+    app.server.add_url_rule('/_perf', 'perf_summary', lambda: jsonify(summary()))
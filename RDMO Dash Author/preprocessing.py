@@ -0,0 +1,103 @@
+import re
+
+import pandas as pd
+from pandas.api.types import is_datetime64_any_dtype
+
+from author_resolution import PARTICLES, SUFFIXES
+
+# Formats seen in the research workbooks, most common first. Each one is tried
+# as a single vectorized pass over the values the previous formats left unparsed.
+DATE_FORMATS = (
+    '%Y-%m-%d',
+    '%Y-%m-%d %H:%M:%S',
+    '%m/%d/%Y',
+    '%d/%m/%Y',
+    '%B %d, %Y',
+    '%b %d, %Y',
+    '%d %B %Y',
+    '%B %Y',
+    '%b %Y',
+    '%Y',
+)
+
+# Authors are one per line, or comma/semicolon separated within a line
+AUTHOR_SEPARATOR = r'\s*[\r\n;,]\s*'
+
+# Surname-first names ("Cruz, Juan", "Dela Cruz, J.M.") get PAIR_MARK instead of their
+# comma in one regex pass before the split, so the split leaves them whole. Matches
+# start at a separator (cells are prefixed with a newline), which lets the regex
+# engine skip straight from one separator to the next.
+PAIR_MARK = '\x1f'
+_SURNAME = rf"(?:(?:{'|'.join(sorted(PARTICLES))})[ \t]+)*[^\W\d_]{{2,}}"
+_GIVEN = r"[^\W\d_]+\.?(?:[ \t]*[^\W\d_]\.)*"  # "Juan", "J.", "J.M.", "Juan M."
+_NEXT_NAME = r"(?=[ \t]*(?:[\r\n;,]|$))"
+_LINE_END = r"(?=[ \t]*(?:[\r\n;]|$))"
+SURNAME_FIRST = re.compile(
+    # \1 the separator before the surname (\2 when it is a comma), \3 the surname, \4 the given names.
+    # After a comma only "Surname, Given" with given names or initials is a pair; a line that is
+    # just "Surname, Given Names" is one name whatever the given names look like.
+    rf"([\r\n;]|(,))(?=[ \t]*[^\W\d_]{{2}})([ \t]*{_SURNAME})[ \t]*,[ \t]*"
+    rf"((?(2){_GIVEN}{_NEXT_NAME}|(?:{_GIVEN}{_NEXT_NAME}|[^,\r\n;]+?{_LINE_END})))"
+    # \5: a suffix stays with the name before it ("Juan Cruz, Jr.")
+    rf"|,[ \t]*((?:{'|'.join(sorted(SUFFIXES))})\.?){_NEXT_NAME}",
+    re.IGNORECASE,
+)
+
+
+def parse_dates(values):
+    """Parse free-form publication dates into a datetime64 Series.
+
+    Only the distinct strings are parsed: known formats first (fast, exact),
+    then pandas' mixed-format parser for whatever is left. Unparseable values
+    become NaT.
+    """
+    values = pd.Series(values)
+    if is_datetime64_any_dtype(values):
+        return values
+
+    codes, uniques = pd.factorize(values.astype('string').str.strip())
+    uniques = pd.Series(uniques, dtype='string')
+    parsed = pd.Series(pd.NaT, index=uniques.index, dtype='datetime64[ns]')
+    pending = (uniques != '').astype(bool)
+
+    for fmt in DATE_FORMATS:
+        if not pending.any():
+            break
+        attempt = pd.to_datetime(uniques[pending], format=fmt, errors='coerce')
+        hits = attempt.index[attempt.notna()]
+        parsed[hits] = attempt[hits]
+        pending[hits] = False
+
+    if pending.any():
+        parsed[pending] = pd.to_datetime(uniques[pending], format='mixed', errors='coerce')
+
+    # factorize marks missing values with -1; point them at an appended NaT
+    lookup = pd.concat([parsed, pd.Series([pd.NaT], dtype='datetime64[ns]')], ignore_index=True)
+    return pd.Series(lookup.to_numpy()[codes], index=values.index, name=values.name)
+
+
+def publication_years(values):
+    """Year of each publication date as a nullable Int64 Series aligned with ``values``."""
+    return parse_dates(values).dt.year.astype('Int64')
+
+
+def school_year_labels(years):
+    """Map years to "SY 2020-2021" style labels; missing years stay missing."""
+    years = pd.Series(years).astype('Int64')
+    return 'SY ' + years.astype('string') + '-' + (years + 1).astype('string')
+
+
+def split_authors(df, column):
+    """Return ``df`` with one row per author in ``column``.
+
+    Author cells are comma/semicolon/newline separated; names are trimmed in
+    the same split and empty entries (trailing commas, blank lines) are
+    dropped. Surname-first names such as "Cruz, Juan" stay whole.
+    """
+    cells = '\n' + df[column].astype('string').str.strip()
+    cells = cells.str.replace(SURNAME_FIRST, rf"\1\3{PAIR_MARK}\4\5", regex=True)
+    names = cells.str.split(AUTHOR_SEPARATOR, regex=True)
+    exploded = df.assign(**{column: names}).explode(column, ignore_index=True)
+    exploded = exploded[exploded[column].notna() & (exploded[column] != '')]
+    exploded[column] = exploded[column].str.replace(PAIR_MARK, ', ', regex=False)
+    return exploded.reset_index(drop=True)
@@ -0,0 +1,70 @@
+"""Pre-render dashboard figures to static JSON for published reports.
+
+    python render.py --workers 8
+
+Renders AuthorApp's full school-year range for every author and
+departmentApp's charts for every campus / college / program selection.
+The apps serve these files instead of recomputing, but only while the
+API's data version matches the one a snapshot was rendered from; re-run
+after each import to bring them back into use.
+"""
+import argparse
+import functools
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from snapshots import SNAPSHOT_DIR, save_snapshot
+
+
+def render_author(name):
+    import AuthorApp
+
+    years = AuthorApp.available_school_years
+    save_snapshot('authors', name, AuthorApp.compute_graphs(name, years[0], years[-1]), AuthorApp.tables.version)
+
+
+def render_department(version, selection):
+    import departmentApp
+
+    save_snapshot('departments', list(selection), departmentApp.compute_charts(*selection), version)
+
+
+def department_selections(hierarchy):
+    # Mirrors the cascade: campus alone, campus + college, campus + college + program
+    for campus in hierarchy:
+        yield campus['camp_id'], None, None
+        for college in campus['colleges']:
+            yield campus['camp_id'], college['id'], None
+            for program in college['programs']:
+                yield campus['camp_id'], college['id'], program['id']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    args = parser.parse_args()
+
+    # With the fork start method (Linux) workers inherit the data loaded here. With spawn
+    # (Windows, macOS) each worker imports AuthorApp and downloads the tables itself, once.
+    import AuthorApp
+    import departmentApp
+    import requests
+
+    authors = sorted(AuthorApp.df['name'].dropna().unique())
+    response = requests.get(f"{departmentApp.API_BASE_URL}/hierarchy", timeout=30)
+    response.raise_for_status()
+    selections = list(department_selections(response.json()))
+    # Department snapshots are labelled with the data version they are rendered from
+    version = departmentApp.data_version()
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        list(pool.map(render_author, authors, chunksize=32))
+        list(pool.map(functools.partial(render_department, version), selections, chunksize=8))
+
+    print(f"Rendered {len(authors)} authors and {len(selections)} department selections "
+          f"into {SNAPSHOT_DIR} in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+import os
+import dash
+from dash import dcc, html
+from dash.dependencies import Input, Output
+import requests
+import pandas as pd
+import plotly.express as px
+import perf
+
+# Define the Flask API base URL
+API_BASE_URL = os.environ.get("RDMO_API_URL", "http://127.0.0.1:5000")  # Update if hosted elsewhere
+
+# Last /rollup response; re-downloaded only when the API's ETag changes
+rollup_cache = {'etag': None, 'body': None}
+
+def fetch_rollup():
+    headers = {'If-None-Match': rollup_cache['etag']} if rollup_cache['etag'] else {}
+    response = requests.get(f"{API_BASE_URL}/rollup", headers=headers, timeout=30)
+    if response.status_code == 304:
+        return rollup_cache['body']
+    response.raise_for_status()
+    rollup_cache.update(etag=response.headers.get('ETag'), body=response.json())
+    return rollup_cache['body']
+
+# Initialize Dash app
+app = dash.Dash(__name__)
+
+app.layout = html.Div([
+    # Top bar
+    html.Div([
+        html.Img(src="/assets/TIPLogo.jpg", style={
+            'height': '80px',
+            'margin-left': '20px',
+            'margin-top': '10px'
+        }),
+        html.Div(style={
+            'margin-left': '30px',
+            'display': 'flex',
+            'flexDirection': 'column',
+            'justify-content': 'center'
+        }, children=[
+            html.Span("Academic Research Unit", style={'font-size': '24px', 'color': 'white'}),
+            html.Span("Technological Institute of the Philippines", style={'font-size': '16px', 'color': 'white', 'margin-top': '5px'})
+        ])
+    ], style={'backgroundColor': '#333333', 'height': '140px', 'display': 'flex', 'align-items': 'center'}),
+
+    # Main content container
+    html.Div([
+        html.H1("Campus Comparison", style={'text-align': 'left', 'margin-left': '20px', 'margin-bottom': '20px', 'font-size': '2.5em', 'color': '#54473F'}),
+
+        html.Div([
+            html.Label("Compare:", style={'margin-right': '10px', 'font-weight': 'bold', 'color': '#54473F'}),
+            dcc.RadioItems(
+                id='rollup-level',
+                options=[{'label': 'Colleges', 'value': 'college'}, {'label': 'Campuses', 'value': 'campus'}],
+                value='college',
+                inline=True
+            )
+        ], style={'margin-left': '20px'}),
+
+        dcc.Graph(id='rollup-heatmap', style={'margin': '20px'}),
+    ], style={'flex': 1, 'display': 'flex', 'flexDirection': 'column'}),
+
+    # Yellow bottom bar
+    html.Div(style={'backgroundColor': '#ffcc00', 'height': '80px', 'width': '100%'})
+], style={'display': 'flex', 'flexDirection': 'column', 'minHeight': '100vh'})
+
+
+@app.callback(
+    Output('rollup-heatmap', 'figure'),
+    Input('rollup-level', 'value')
+)
+@perf.profiled
+def update_heatmap(level):
+    try:
+        with perf.stage('fetch'):
+            rollup = fetch_rollup()
+    except requests.exceptions.RequestException:
+        return {}
+
+    with perf.stage('aggregate'):
+        # JSON object keys arrive as strings. Ids are read as Int64 so a NULL campus_id does
+        # not turn the column into floats, whose "1.0" would match no key
+        campuses = rollup['campuses']
+        colleges = rollup['colleges']
+        if level == 'campus':
+            df = pd.DataFrame(rollup['campus_totals'], columns=['camp_id', 'school_year', 'papers'])
+            df['camp_id'] = df['camp_id'].astype('Int64')
+            df['row'] = [campuses.get(str(campus), "Unassigned") for campus in df['camp_id']]
+        else:
+            df = pd.DataFrame(rollup['cells'], columns=['camp_id', 'college_id', 'school_year', 'papers'])
+            df[['camp_id', 'college_id']] = df[['camp_id', 'college_id']].astype('Int64')
+            df['row'] = [
+                f"{campuses.get(str(campus), 'Unassigned')} / {colleges.get(str(college), {}).get('college_name', 'Unknown')}"
+                for campus, college in zip(df['camp_id'], df['college_id'])
+            ]
+        matrix = df.pivot_table(index='row', columns='school_year', values='papers', aggfunc='sum', fill_value=0)
+        matrix = matrix.reindex(columns=rollup['years'], fill_value=0)
+
+    if matrix.empty:
+        return {}
+
+    with perf.stage('figures'):
+        fig = px.imshow(
+            matrix,
+            labels={'x': 'School Year', 'y': '', 'color': 'Papers'},
+            text_auto=True,
+            aspect='auto',
+            color_continuous_scale='YlOrBr',
+            title="Papers per School Year",
+            template='plotly_white'
+        ).update_layout(title_x=0.5, title_font_size=20, height=max(400, 30 * len(matrix)))
+
+    return fig
+
+perf.install(app)
+
+if __name__ == '__main__':
+    app.run_server(debug=True)
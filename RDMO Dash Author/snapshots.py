@@ -0,0 +1,47 @@
+import hashlib
+import json
+import os
+import tempfile
+
+import plotly.utils
+
+# Pre-rendered callback outputs written by render.py
+SNAPSHOT_DIR = os.environ.get(
+    'RDMO_SNAPSHOT_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'snapshots')
+)
+
+
+def snapshot_path(kind, key):
+    # Keys are author names or id tuples; hash them so any value makes a safe file name
+    digest = hashlib.sha1(json.dumps(key).encode('utf-8')).hexdigest()
+    return os.path.join(SNAPSHOT_DIR, kind, f"{digest}.json")
+
+
+def save_snapshot(kind, key, outputs, version):
+    """Write a callback's outputs (figures included) as static JSON.
+
+    ``version`` is the API's data version the outputs were computed from.
+    """
+    path = snapshot_path(kind, key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Write then rename, so a running app never reads a half-written file
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump({'key': key, 'version': version, 'outputs': list(outputs)}, f, cls=plotly.utils.PlotlyJSONEncoder)
+    os.replace(tmp_path, path)
+
+
+def load_snapshot(kind, key, version):
+    """Return the saved outputs for ``key``, or None when nothing was rendered
+    from data at ``version`` (the data changed since, or the version is unknown).
+    """
+    if not version:
+        return None
+    try:
+        with open(snapshot_path(kind, key), encoding='utf-8') as f:
+            snapshot = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if snapshot.get('version') != version:
+        return None
+    return snapshot.get('outputs')